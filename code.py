@@ -10,6 +10,10 @@ import os
 from adafruit_matrixportal.matrixportal import MatrixPortal
 from adafruit_display_text.label import Label
 from adafruit_bitmap_font import bitmap_font
+from network_transport import make_transport, failure_state
+from panel_layout import LOGO_WIDTH, LOGO_HEIGHT, LOGO_RED, LOGO_WHITE, logo_pixels, pick_bit_depth, tile_layout
+from memory_governor import MemoryGovernor
+from display_schedule import Schedule, dim
 
 # ==== USER-CONFIGURABLE CONSTANTS ====
 DEFAULT_SUBS = 300
@@ -24,22 +28,42 @@ NORMAL_COLOR = 0xFFFFFF  # White
 WIFI_RETRY_INTERVAL = 10
 ERROR_RETRY_INTERVAL = 30
 NORMAL_REFRESH_INTERVAL = 5 * 60
+STALE_AFTER_POLLS = 3  # STATS_SERVER stats older than this many of the server's polls count as a failed fetch
 
 CHAR_SPACING = 1
 
+YOUTUBE_RED = 0xFC0D1B
+
 # ==== Load from settings.toml ====
 API_KEY = os.getenv("YOUTUBE_API_KEY")
 CHANNEL_ID = os.getenv("CHANNEL_ID")
 channel_name = os.getenv("CHANNEL_NAME")
+# Optional LAN aggregator (stats_server.py), e.g. "http://192.168.1.20:8080". No API key needed then.
+STATS_SERVER = os.getenv("STATS_SERVER")
+# Chained panels: e.g. MATRIX_WIDTH = 128 for two 64x32 side by side, add MATRIX_TILE_ROWS = 2 for a 2x2 stack.
+MATRIX_WIDTH = int(os.getenv("MATRIX_WIDTH") or "64")
+MATRIX_HEIGHT = int(os.getenv("MATRIX_HEIGHT") or "32")
+MATRIX_TILE_ROWS = int(os.getenv("MATRIX_TILE_ROWS") or "1")
 
 # Print configuration
 print(f"YouTube API Key: {API_KEY}")
 print(f"Channel ID: {CHANNEL_ID}")
 print(f"Channel Name: {channel_name}")
 
+
+# ==== Schedule ====
+schedule = Schedule()
+
 # ==== MatrixPortal setup ====
-print("Setting up MatrixPortal...")
-matrixportal = MatrixPortal(status_neopixel=board.NEOPIXEL, bit_depth=6, debug=True)
+base_colors = [0x000000, YOUTUBE_RED, NORMAL_COLOR, FALLBACK_COLOR, ERROR_COLOR]
+bit_depth = int(os.getenv("BIT_DEPTH") or "0") or pick_bit_depth(
+    base_colors + [dim(color, level) for level in schedule.levels() for color in base_colors])
+print(f"Setting up MatrixPortal ({MATRIX_WIDTH}x{MATRIX_HEIGHT}, bit_depth={bit_depth})...")
+matrixportal = MatrixPortal(status_neopixel=board.NEOPIXEL, bit_depth=bit_depth, width=MATRIX_WIDTH,
+                            height=MATRIX_HEIGHT, tile_rows=MATRIX_TILE_ROWS, debug=True)
+display = matrixportal.graphics.display
+transport = make_transport(matrixportal.network)
+layout = tile_layout(0, 0, display.width, display.height)
 
 
 # Extremely simple MAC address detection that avoids errors
@@ -77,36 +101,12 @@ YOUTUBE_API_URL = (
     "https://www.googleapis.com/youtube/v3/channels"
     f"?part=statistics&id={CHANNEL_ID}&key={API_KEY}"
 )
+if STATS_SERVER:
+    YOUTUBE_API_URL = f"{STATS_SERVER}/stats/{CHANNEL_ID}"
 print(f"API URL: {YOUTUBE_API_URL}")
 
 main_group = displayio.Group()
 
-# ==== YouTube Logo ====
-youtube_red = 0xFC0D1B
-logo_bitmap = displayio.Bitmap(13, 9, 2)
-logo_palette = displayio.Palette(2)
-logo_palette[0] = 0x000000
-logo_palette[1] = youtube_red
-
-for x in range(13):
-    for y in range(9):
-        if ((x == 0 and y == 0) or (x == 0 and y == 8) or
-                (x == 12 and y == 0) or (x == 12 and y == 8)):
-            logo_bitmap[x, y] = 0
-        else:
-            logo_bitmap[x, y] = 1
-
-play_bitmap = displayio.Bitmap(5, 5, 2)
-play_palette = displayio.Palette(2)
-play_palette[0] = youtube_red
-play_palette[1] = 0xFFFFFF
-
-for x, y in [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (2, 1), (2, 2), (2, 3), (3, 2)]:
-    play_bitmap[x, y] = 1
-
-main_group.append(displayio.TileGrid(logo_bitmap, pixel_shader=logo_palette, x=1, y=1))
-main_group.append(displayio.TileGrid(play_bitmap, pixel_shader=play_palette, x=5, y=3))
-
 # ==== Fonts ====
 try:
     channel_font = bitmap_font.load_font("/fonts/Rockbox-Propfont.bdf")
@@ -130,29 +130,73 @@ try:
 except:
     label_font = terminalio.FONT
 
+# Collects garbage between frames; only the cache step applies to a single channel with no fades.
+governor = MemoryGovernor(fonts=(channel_font, subs_value_font, views_value_font, label_font),
+                          steps=("shrink caches",))
+
+# ==== Static graphics ====
+# The logo and the "sub"/"view" captions come from one sprite sheet with a shared palette,
+# loaded in one read. Build it with make_sprites.py and copy sprites.bmp to the board.
+SPRITE_LOGO = 0
+SPRITE_SUB = 1
+SPRITE_VIEW = 2
+SPRITE_COUNT = 3
+CAPTION_INK = 3  # Palette entry the captions are drawn in: 0 background, 1 YouTube red, 2 white
+caption_labels = []
+try:
+    import adafruit_imageload
+    sprite_sheet, sprite_palette = adafruit_imageload.load("/sprites.bmp", bitmap=displayio.Bitmap,
+                                                           palette=displayio.Palette)
+    sprite_width = sprite_sheet.width // SPRITE_COUNT
+    sprite_height = sprite_sheet.height
+except Exception as e:
+    # No sprite sheet or no adafruit_imageload: draw the logo here and use Labels for the captions
+    print(f"Sprite sheet unavailable ({e}), drawing the logo instead")
+    sprite_width = LOGO_WIDTH
+    sprite_height = LOGO_HEIGHT
+    sprite_sheet = displayio.Bitmap(LOGO_WIDTH, LOGO_HEIGHT, 4)
+    sprite_palette = displayio.Palette(4)
+    sprite_palette[0] = 0x000000
+    sprite_palette[LOGO_RED] = YOUTUBE_RED
+    sprite_palette[LOGO_WHITE] = 0xFFFFFF
+    for x, y, color in logo_pixels():
+        sprite_sheet[x, y] = color
+    caption_labels = [
+        Label(label_font, text="sub", color=NORMAL_COLOR, x=layout["sub_label"][0], y=layout["sub_label"][1]),
+        Label(label_font, text="view", color=NORMAL_COLOR, x=layout["views_label"][0], y=layout["views_label"][1]),
+    ]
+sprite_palette[CAPTION_INK] = NORMAL_COLOR
+
+main_group.append(displayio.TileGrid(sprite_sheet, pixel_shader=sprite_palette, tile_width=sprite_width,
+                                     tile_height=sprite_height, default_tile=SPRITE_LOGO,
+                                     x=layout["logo"][0], y=layout["logo"][1]))
+if not caption_labels:
+    # Caption tiles are centred on the same y a Label would use
+    for tile, (x, y) in ((SPRITE_SUB, layout["sub_label"]), (SPRITE_VIEW, layout["views_label"])):
+        main_group.append(displayio.TileGrid(sprite_sheet, pixel_shader=sprite_palette, tile_width=sprite_width,
+                                             tile_height=sprite_height, default_tile=tile,
+                                             x=x, y=y - sprite_height // 2))
+for label in caption_labels:
+    main_group.append(label)
+
 # ==== Labels ====
-sub_label = Label(label_font, text="sub", color=NORMAL_COLOR, x=2, y=14)
-sub_value = Label(subs_value_font, text="Loading", color=NORMAL_COLOR, anchored_position=(64, 16),
+sub_value = Label(subs_value_font, text="Loading", color=NORMAL_COLOR, anchored_position=layout["sub_value"],
                   anchor_point=(1.0, 0.5))
-views_label = Label(label_font, text="view", color=NORMAL_COLOR, x=2, y=25)
-views_value = Label(views_value_font, text="Loading", color=NORMAL_COLOR, anchored_position=(64, 27),
+views_value = Label(views_value_font, text="Loading", color=NORMAL_COLOR, anchored_position=layout["views_value"],
                     anchor_point=(1.0, 0.5))
 
-main_group.append(sub_label)
 main_group.append(sub_value)
-main_group.append(views_label)
 main_group.append(views_value)
 
 # ==== Scrolling Setup ====
-display_width = matrixportal.graphics.display.width
-visible_x_start = 15
-visible_x_end = display_width
+visible_x_start = layout["visible_x_start"]
+visible_x_end = layout["visible_x_end"]
 char_labels = []
 x_offset = 0
 text_pixel_width = 0
 for c in channel_name:
     label = Label(channel_font, text=c, color=NORMAL_COLOR)
-    label.y = y_position
+    label.y = layout["top"] + y_position
     width = label.bounding_box[2]
     char_labels.append((label, x_offset))
     x_offset += width + CHAR_SPACING
@@ -161,7 +205,7 @@ for c in channel_name:
 scrolling_chars_group = displayio.Group()
 main_group.append(scrolling_chars_group)
 
-matrixportal.graphics.display.root_group = main_group
+display.root_group = main_group
 
 
 # ==== Functions ====
@@ -176,17 +220,39 @@ def format_stat(value):
         return f"{value:,}"
 
 
+def set_caption_color(color):
+    sprite_palette[CAPTION_INK] = color
+    for label in caption_labels:
+        label.color = color
+
+
 def show_stats(subs, views, color):
-    sub_label.color = sub_value.color = views_label.color = views_value.color = color
+    set_caption_color(dim(color, brightness))
+    sub_value.color = views_value.color = dim(color, brightness)
     sub_value.text = format_stat(subs)
     views_value.text = format_stat(views)
 
 
+def apply_schedule(rule):
+    """Set brightness, scroll speed and refresh cadence for a schedule rule (None means normal)."""
+    global brightness, scroll_speed, normal_interval
+    brightness = rule["brightness"] if rule else 1.0
+    scroll_speed = (rule and rule["scroll"]) or SCROLL_SPEED
+    normal_interval = (rule and rule["refresh"]) or NORMAL_REFRESH_INTERVAL
+    # The panel only supports on/off brightness, so dimming scales the colours instead
+    display.brightness = 1.0 if brightness > 0 else 0.0
+    sprite_palette[LOGO_RED] = dim(YOUTUBE_RED, brightness)
+    sprite_palette[LOGO_WHITE] = dim(0xFFFFFF, brightness)
+    for label, _ in char_labels:
+        label.color = dim(NORMAL_COLOR, brightness)
+    show_stats(last_subs, last_views, last_color)
+
+
 # Safe network info function that never throws errors
 def print_network_info():
     """Print the network connection details including IP address"""
     try:
-        if not matrixportal.network.is_connected:
+        if not transport.is_connected:
             print("Not connected to WiFi")
             return
 
@@ -200,12 +266,13 @@ def print_network_info():
 # Initiate WiFi connection at startup
 print("Initial WiFi connection attempt...")
 try:
-    matrixportal.network.connect()
+    transport.connect()
     print("Successfully connected to WiFi")
     # Print IP address after successful connection
     print_network_info()
 except Exception as e:
     print(f"Initial WiFi connection issue: {e}")
+schedule.sync_time(matrixportal.network)
 
 # ==== State ====
 last_subs = DEFAULT_SUBS
@@ -214,10 +281,13 @@ last_color = NORMAL_COLOR
 last_api_refresh = 0
 last_wifi_attempt = 0
 interval = NORMAL_REFRESH_INTERVAL
+normal_interval = NORMAL_REFRESH_INTERVAL
+brightness = 1.0
 
 # ==== Main loop ====
 SCROLL_SPEED = 0.05
 SCROLL_RESET_PAUSE = 0.5
+scroll_speed = SCROLL_SPEED
 scroll_x = visible_x_end
 pause_at_end = False
 pause_start_time = 0
@@ -226,9 +296,20 @@ last_scroll_time = time.monotonic()
 while True:
     now = time.monotonic()
 
-    # Scrolling logic
-    if not pause_at_end:
-        if now - last_scroll_time >= SCROLL_SPEED:
+    # Time-of-day schedule
+    if schedule.check(now):
+        apply_schedule(schedule.active)
+        if last_color == NORMAL_COLOR:
+            interval = normal_interval
+        if schedule.ended:
+            # Catch up on what was missed while the window throttled polling
+            last_api_refresh = now - interval
+
+    # Scrolling logic (nothing to draw while the panel is blanked)
+    if brightness == 0:
+        pass
+    elif not pause_at_end:
+        if now - last_scroll_time >= scroll_speed:
             scroll_x -= 1
             while scrolling_chars_group:
                 scrolling_chars_group.pop()
@@ -237,9 +318,11 @@ while True:
                 if visible_x_start <= screen_x < visible_x_end:
                     label.x = screen_x
                     scrolling_chars_group.append(label)
-            if scroll_x <= -text_pixel_width:
+            if scroll_x <= layout["left"] - text_pixel_width:
                 pause_at_end = True
                 pause_start_time = now
+                # Nothing moves during SCROLL_RESET_PAUSE, so collect now rather than mid-scroll
+                governor.idle("scroll pause")
             last_scroll_time = now
     else:
         if now - pause_start_time >= SCROLL_RESET_PAUSE:
@@ -255,9 +338,9 @@ while True:
                 try:
                     # Check connection status - but don't immediately fail
                     print("Checking WiFi connection...")
-                    if not matrixportal.network.is_connected:
+                    if not transport.is_connected:
                         print("Attempting to reconnect WiFi...")
-                        matrixportal.network.connect()
+                        transport.connect()
                         # Print IP address after reconnection
                         print_network_info()
                     else:
@@ -269,11 +352,21 @@ while True:
                     print(f"WiFi connection issue: {e}")
 
             print("Fetching YouTube stats...")
-            response = matrixportal.network.fetch(YOUTUBE_API_URL)
+            response = transport.fetch(YOUTUBE_API_URL)
             print(f"Response type: {type(response)}")
 
             # Handle different response types
-            if hasattr(response, 'json'):
+            if STATS_SERVER:
+                # stats_server.py answers "subscribers,views,age_seconds,interval_seconds" - no JSON to parse
+                if getattr(response, "status_code", 200) != 200:
+                    raise ValueError(f"Stats server returned {response.status_code}")
+                fields = response.text.strip().split(",")
+                print(f"Stats server data is {fields[2]}s old")
+                if int(fields[2]) > STALE_AFTER_POLLS * int(fields[3]):
+                    # The server's own YouTube polling is failing; don't show its old numbers as fresh
+                    raise ValueError(f"Stats server data is stale ({fields[2]}s old)")
+                data = {"items": [{"statistics": {"subscriberCount": fields[0], "viewCount": fields[1]}}]}
+            elif hasattr(response, 'json'):
                 print("Got Response object, parsing JSON...")
                 data = response.json()
             elif isinstance(response, dict):
@@ -284,6 +377,8 @@ while True:
                 raise ValueError(f"Unexpected response type: {type(response)}")
 
             stats = data["items"][0]["statistics"]
+            # Let the full response go before the next collection
+            response = data = None
 
             # Print detailed statistics
             print("YouTube Statistics:")
@@ -296,30 +391,30 @@ while True:
             last_subs = raw_subs + SUB_ADJUST
             last_views = raw_views + VIEW_ADJUST
             last_color = NORMAL_COLOR
-            interval = NORMAL_REFRESH_INTERVAL
+            interval = normal_interval
             print(f"Fetched stats successfully: {last_subs} subscribers, {last_views} views")
+            print(f"Network: {transport.requests} requests, "
+                  f"average latency {transport.total_latency / transport.requests:.2f}s")
 
         except Exception as e:
             print(f"Error: {e}")
+            if isinstance(e, MemoryError):
+                governor.memory_error()
             # Don't immediately assume WiFi issue, check connection state
             wifi_status = "unknown"
             try:
-                wifi_status = "connected" if matrixportal.network.is_connected else "disconnected"
+                wifi_status = "connected" if transport.is_connected else "disconnected"
             except:
                 pass
 
             print(f"WiFi status check: {wifi_status}")
-
-            if wifi_status == "disconnected":
-                last_color = FALLBACK_COLOR
-                last_subs = DEFAULT_SUBS
-                last_views = DEFAULT_VIEWS
-                interval = WIFI_RETRY_INTERVAL
-            else:
-                last_color = ERROR_COLOR
-                interval = ERROR_RETRY_INTERVAL
+            # NETWORK_MODE = "faults" in settings.toml drives both branches without touching the network
+            last_subs, last_views, last_color, interval = failure_state(
+                wifi_status, last_subs, last_views, DEFAULT_SUBS, DEFAULT_VIEWS,
+                FALLBACK_COLOR, ERROR_COLOR, WIFI_RETRY_INTERVAL, ERROR_RETRY_INTERVAL)
 
         show_stats(last_subs, last_views, last_color)
         last_api_refresh = now
+        governor.idle("fetch")
 
     time.sleep(0.01)
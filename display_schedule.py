@@ -0,0 +1,152 @@
+# display_schedule.py - time-of-day rules that dim or blank the panel and slow down polling.
+# Copy this file to the CIRCUITPY board next to code.py.
+#
+# Rules go in settings.toml as SCHEDULE_1, SCHEDULE_2, ... each a window plus settings, e.g.
+#   SCHEDULE_1 = "22:00-07:00 brightness=0 refresh=3600"
+#   SCHEDULE_2 = "18:00-22:00 brightness=0.3 scroll=0.1 refresh=900"
+# Windows may cross midnight. The first matching rule wins. Settings a rule leaves out keep their normal value.
+#   brightness - 0 blanks the panel, 0.3 is 30% colour, 1 is full
+#   scroll     - seconds per scroll step (bigger is slower and uses less CPU)
+#   refresh    - seconds between API fetches
+# When a window ends, or hands over to one that polls more often, one catch-up fetch runs straight away.
+#
+# The clock is set from NTP (adafruit_ntp on the S3, the ESP32 co-processor on the M4) and kept in the RTC.
+# TZ_OFFSET in settings.toml is your offset from UTC in hours; quote half-hour zones, e.g. "5.5".
+# Until the clock is set, no rule applies.
+
+import os
+import time
+import rtc
+
+CHECK_INTERVAL = 30
+RESYNC_INTERVAL = 24 * 60 * 60
+RETRY_SYNC_INTERVAL = 10 * 60
+
+
+def dim(color, level):
+    """Scale a 0xRRGGBB colour by level (0.0 - 1.0)."""
+    if level >= 1:
+        return color
+    return ((int(((color >> 16) & 0xFF) * level) << 16) | (int(((color >> 8) & 0xFF) * level) << 8)
+            | int((color & 0xFF) * level))
+
+
+def parse_clock(text):
+    hours, minutes = text.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def parse_rule(text):
+    parts = text.split()
+    start, end = parts[0].split("-")
+    rule = {"text": text, "start": parse_clock(start), "end": parse_clock(end),
+            "brightness": 1.0, "scroll": None, "refresh": None}
+    for setting in parts[1:]:
+        key, value = setting.split("=")
+        if key == "brightness":
+            rule["brightness"] = max(0.0, min(1.0, float(value)))
+        elif key == "scroll":
+            rule["scroll"] = float(value)
+        elif key == "refresh":
+            rule["refresh"] = int(value)
+        else:
+            raise ValueError(f"Unknown schedule setting {key!r} in {text!r}")
+    return rule
+
+
+def catch_up_needed(old, new):
+    """True when going from rule old to rule new (None is normal running) ends a window or speeds polling up.
+
+    Handing over straight to a window that polls no faster needs no catch-up.
+    """
+    if old is None:
+        return False
+    if new is None:
+        return True
+    if old["refresh"] is None:
+        return False
+    return new["refresh"] is None or new["refresh"] < old["refresh"]
+
+
+class Schedule:
+    def __init__(self):
+        self.rules = []
+        index = 1
+        while True:
+            text = os.getenv(f"SCHEDULE_{index}")
+            if not text:
+                break
+            try:
+                self.rules.append(parse_rule(text))
+            except ValueError as e:
+                print(f"Schedule: skipping SCHEDULE_{index}: {e}")
+            index += 1
+        self.tz_offset = float(os.getenv("TZ_OFFSET") or 0)
+        self.network = None
+        self.synced = False
+        self.last_sync = 0
+        self.last_check = -CHECK_INTERVAL
+        self.active = None
+        self.ended = False
+        print(f"Schedule: {len(self.rules)} rule(s)")
+
+    def levels(self):
+        """Brightness levels the rules use, for picking the panel bit_depth."""
+        return [rule["brightness"] for rule in self.rules if 0 < rule["brightness"] < 1]
+
+    def sync_time(self, network):
+        """Set the RTC from NTP. Safe to call without Wi-Fi; it just tries again later."""
+        self.network = network
+        self.last_sync = time.monotonic()
+        if not self.rules:
+            return
+        try:
+            import socketpool
+            import wifi
+            import adafruit_ntp
+            ntp = adafruit_ntp.NTP(socketpool.SocketPool(wifi.radio), tz_offset=self.tz_offset)
+            rtc.RTC().datetime = ntp.datetime
+            self.synced = True
+        except Exception as e:
+            try:
+                # ESP32 co-processor on the M4 keeps NTP time itself
+                epoch = network._wifi.esp.get_time()[0]
+                rtc.RTC().datetime = time.localtime(int(epoch + self.tz_offset * 3600))
+                self.synced = True
+            except Exception as e2:
+                print(f"Schedule: could not set the clock ({e}; {e2})")
+        if self.synced:
+            now = time.localtime()
+            print(f"Schedule: clock set to {now.tm_hour:02d}:{now.tm_min:02d}")
+
+    def rule_at(self, minute):
+        for rule in self.rules:
+            start, end = rule["start"], rule["end"]
+            if start <= end and start <= minute < end:
+                return rule
+            if start > end and (minute >= start or minute < end):
+                return rule
+        return None
+
+    def check(self, now):
+        """Re-evaluate every CHECK_INTERVAL seconds. Returns True when the active rule changed.
+
+        After a change, self.active is the new rule (None for normal running) and
+        self.ended is True if a window just closed or polling sped up, which calls for a catch-up fetch.
+        """
+        if not self.rules or now - self.last_check < CHECK_INTERVAL:
+            return False
+        self.last_check = now
+        resync = RESYNC_INTERVAL if self.synced else RETRY_SYNC_INTERVAL
+        if self.network is not None and now - self.last_sync >= resync:
+            self.sync_time(self.network)
+        rule = None
+        if self.synced:
+            local = time.localtime()
+            rule = self.rule_at(local.tm_hour * 60 + local.tm_min)
+        if rule is self.active:
+            return False
+        self.ended = catch_up_needed(self.active, rule)
+        self.active = rule
+        print(f"Schedule: {rule['text'] if rule else 'normal running'}")
+        return True
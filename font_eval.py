@@ -0,0 +1,386 @@
+# font_eval.py - try every BDF font on your computer instead of on the board.
+# Replaces the edit-and-reload loop in font_testing.py: no hardware, no network, one command.
+#
+# Usage (desktop Python 3, no extra packages needed):
+#   python font_eval.py                                   # fonts/ against the names in settings.toml
+#   python font_eval.py fonts --settings a.toml b.toml    # names from several boards' settings files
+#   python font_eval.py fonts --names "YouTube.com/profgallaugher" --width 128
+#   python font_eval.py fonts --value-font test           # try each font for the numbers instead
+#
+# Each font is tried as the scrolling channel-name font. The numbers and the "sub"/"view" captions
+# use --value-font and --label-font, which default to what code.py loads (helvB08 and Rockbox);
+# pass "test" for either to put the font under test in that role too.
+#
+# For each font it prints load time, glyph memory, pixel widths of the real strings
+# measured the way adafruit_display_text lays them out, whether they fit the visible
+# scroll window, and how many scroll frames each channel name needs.
+# It also writes one PNG contact sheet per font into the output folder, plus report.csv.
+
+import argparse
+import csv
+import os
+import re
+import struct
+import time
+import zlib
+
+from panel_layout import LOGO_RED, logo_pixels, tile_layout
+
+# Same values as code.py
+CHAR_SPACING = 1
+SCROLL_SPEED = 0.05
+YOUTUBE_RED = 0xFC0D1B
+NORMAL_COLOR = 0xFFFFFF
+
+# Rough per-glyph object overhead (Glyph tuple + Bitmap header) on CircuitPython, in bytes
+GLYPH_OVERHEAD = 64
+
+SAMPLE_STATS = [0, 999, 8_920, 757_696, 1_234_567, 12_345_678, 123_456_789, 2_500_000_000]
+CAPTIONS = ["sub", "view"]
+
+
+def format_stat(value):
+    if value >= 100_000_000:
+        return f"{value // 1_000_000}m"
+    elif value >= 10_000_000:
+        return f"{value / 1_000_000:.1f}m"
+    elif value >= 1_000_000:
+        return f"{value / 1_000_000:.2f} mil"
+    else:
+        return f"{value:,}"
+
+
+# ==== BDF loading ====
+class Glyph:
+    def __init__(self, width, height, dx, dy, shift_x, rows):
+        self.width = width
+        self.height = height
+        self.dx = dx
+        self.dy = dy
+        self.shift_x = shift_x
+        self.rows = rows  # one int per row, most significant bit is the leftmost pixel
+
+    def pixel(self, x, y):
+        return (self.rows[y] >> (self.width - 1 - x)) & 1
+
+
+class BDFFont:
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.glyphs = {}
+        started = time.perf_counter()
+        with open(path, encoding="latin-1") as f:
+            lines = f.read().splitlines()
+        properties = {}
+        glyph = None
+        for line in lines:
+            parts = line.split()
+            if not parts:
+                continue
+            key = parts[0]
+            if key in ("FONT_ASCENT", "FONT_DESCENT") and glyph is None:
+                properties[key] = int(parts[1])
+            elif key == "STARTCHAR":
+                glyph = {"encoding": -1, "shift_x": 0, "bbx": (0, 0, 0, 0), "rows": None}
+            elif glyph is None:
+                continue
+            elif key == "ENCODING":
+                glyph["encoding"] = int(parts[1])
+            elif key == "DWIDTH":
+                glyph["shift_x"] = int(parts[1])
+            elif key == "BBX":
+                glyph["bbx"] = tuple(int(p) for p in parts[1:5])
+            elif key == "BITMAP":
+                glyph["rows"] = []
+            elif key == "ENDCHAR":
+                width, height, dx, dy = glyph["bbx"]
+                padded = (width + 7) // 8 * 8
+                rows = [int(row, 16) >> (padded - width) if width else 0 for row in glyph["rows"][:height]]
+                if glyph["encoding"] >= 0:
+                    self.glyphs[chr(glyph["encoding"])] = Glyph(width, height, dx, dy, glyph["shift_x"], rows)
+                glyph = None
+            elif glyph["rows"] is not None:
+                glyph["rows"].append(line.strip())
+        self.load_time = time.perf_counter() - started
+        # adafruit_display_text uses the font's FONT_ASCENT/FONT_DESCENT, or the glyphs of "M j'" without them
+        sample = [self.glyphs[c] for c in "M j'" if c in self.glyphs]
+        self.ascent = properties.get("FONT_ASCENT", max((g.height + g.dy for g in sample), default=0))
+        self.descent = properties.get("FONT_DESCENT", max((-g.dy for g in sample), default=0))
+
+    def missing(self, text):
+        return sorted(set(c for c in text if c not in self.glyphs))
+
+    def glyph_bytes(self, chars):
+        """Estimated RAM for the glyphs a board would load for these characters."""
+        total = 0
+        for c in set(chars):
+            g = self.glyphs.get(c)
+            if g:
+                # displayio.Bitmap with 2 values: 1 bit per pixel, rows padded to 32-bit words
+                total += (g.width + 31) // 32 * 4 * g.height + GLYPH_OVERHEAD
+        return total
+
+
+# ==== Measuring, the way adafruit_display_text.label.Label does ====
+def text_extent(font, text):
+    """Return (left, right, top, bottom) of text relative to the start point and baseline."""
+    left = right = x = 0
+    top = bottom = 0
+    for c in text:
+        g = font.glyphs.get(c)
+        if g is None:
+            continue
+        if x == 0:
+            left = min(left, g.dx)
+        right = max(right, x + g.shift_x, x + g.width + g.dx)
+        if g.height:
+            top = min(top, -(g.height + g.dy))
+            bottom = max(bottom, -g.dy)
+        x += g.shift_x
+    return left, right, top, bottom
+
+
+def label_width(font, text):
+    left, right, _, _ = text_extent(font, text)
+    return right - left
+
+
+def scroller_width(font, name):
+    """Width of the scrolling name: one Label per character plus CHAR_SPACING, like code.py."""
+    return sum(label_width(font, c) + CHAR_SPACING for c in name)
+
+
+# ==== Drawing ====
+class Canvas:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(width * height * 3)
+
+    def set(self, x, y, color, clip=None):
+        x0, x1 = clip or (0, self.width)
+        if x0 <= x < x1 and 0 <= y < self.height:
+            i = (y * self.width + x) * 3
+            self.pixels[i:i + 3] = bytes(((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF))
+
+    def fill(self, x, y, width, height, color):
+        for yy in range(y, y + height):
+            for xx in range(x, x + width):
+                self.set(xx, yy, color)
+
+    def blit(self, other, x, y, scale=1):
+        for oy in range(other.height):
+            for ox in range(other.width):
+                i = (oy * other.width + ox) * 3
+                color = int.from_bytes(other.pixels[i:i + 3], "big")
+                self.fill(x + ox * scale, y + oy * scale, scale, scale, color)
+
+    def draw_text(self, font, text, x, baseline, color=NORMAL_COLOR, clip=None):
+        for c in text:
+            g = font.glyphs.get(c)
+            if g is None:
+                continue
+            top = baseline - g.height - g.dy
+            for gy in range(g.height):
+                for gx in range(g.width):
+                    if g.pixel(gx, gy):
+                        self.set(x + g.dx + gx, top + gy, color, clip)
+            x += g.shift_x
+
+    def draw_label(self, font, text, x, y, **kwargs):
+        """Label at (x, y): y is the vertical middle of the font's ascent."""
+        self.draw_text(font, text, x, y + font.ascent // 2, **kwargs)
+
+    def draw_anchored_right(self, font, text, anchor_x, anchor_y):
+        """Label with anchor_point=(1.0, 0.5) at anchored_position=(anchor_x, anchor_y)."""
+        left, right, top, bottom = text_extent(font, text)
+        self.draw_text(font, text, anchor_x - right, anchor_y - (top + bottom) // 2)
+
+    def save_png(self, path):
+        raw = b"".join(b"\x00" + bytes(self.pixels[y * self.width * 3:(y + 1) * self.width * 3])
+                       for y in range(self.height))
+
+        def chunk(kind, data):
+            return (struct.pack(">I", len(data)) + kind + data
+                    + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)))
+            f.write(chunk(b"IDAT", zlib.compress(raw, 9)))
+            f.write(chunk(b"IEND", b""))
+
+
+def draw_logo(canvas, layout):
+    x0, y0 = layout["logo"]
+    for x, y, color in logo_pixels():
+        canvas.set(x0 + x, y0 + y, YOUTUBE_RED if color == LOGO_RED else NORMAL_COLOR)
+
+
+def render_panel(font, value_font, label_font, name, subs, views, width, height, y_position):
+    """One frame of the display with the name fully scrolled in, each string in its board font."""
+    layout = tile_layout(0, 0, width, height)
+    panel = Canvas(width, height)
+    draw_logo(panel, layout)
+    clip = (layout["visible_x_start"], layout["visible_x_end"])
+    x = layout["visible_x_start"]
+    for c in name:
+        panel.draw_label(font, c, x, layout["top"] + y_position, clip=clip)
+        x += label_width(font, c) + CHAR_SPACING
+    panel.draw_label(label_font, "sub", *layout["sub_label"])
+    panel.draw_label(label_font, "view", *layout["views_label"])
+    panel.draw_anchored_right(value_font, format_stat(subs), *layout["sub_value"])
+    panel.draw_anchored_right(value_font, format_stat(views), *layout["views_value"])
+    return panel
+
+
+def contact_sheet(font, value_font, label_font, names, width, height, y_position, scale):
+    """Rows of panels: one per channel name, then one per sample stat value."""
+    rows = [(name, SAMPLE_STATS[i % len(SAMPLE_STATS)], SAMPLE_STATS[-1 - i % len(SAMPLE_STATS)])
+            for i, name in enumerate(names)]
+    rows += [("", value, value) for value in SAMPLE_STATS]
+    columns = 2
+    gap = 2 * scale
+    cell_w = width * scale + gap
+    cell_h = height * scale + gap
+    sheet_rows = (len(rows) + columns - 1) // columns
+    sheet = Canvas(columns * cell_w + gap, sheet_rows * cell_h + gap)
+    sheet.fill(0, 0, sheet.width, sheet.height, 0x404040)
+    for i, (name, subs, views) in enumerate(rows):
+        panel = render_panel(font, value_font, label_font, name, subs, views, width, height, y_position)
+        sheet.blit(panel, gap + (i % columns) * cell_w, gap + (i // columns) * cell_h, scale)
+    return sheet
+
+
+# ==== Settings ====
+def channel_names_from(path):
+    """CHANNEL_NAME, CHANNEL_NAME2, ... from a settings.toml (read line by line, tolerant of typos)."""
+    names = []
+    with open(path) as f:
+        for line in f:
+            match = re.match(r'\s*CHANNEL_NAME\d*\s*=\s*"(.*)"', line)
+            if match:
+                names.append(match.group(1))
+    return names
+
+
+def evaluate(font, value_font, label_font, names, width, height, scroll_speed):
+    layout = tile_layout(0, 0, width, height)
+    visible = layout["visible_x_end"] - layout["visible_x_start"]
+    stats = [format_stat(v) for v in SAMPLE_STATS]
+    caption_width = max(label_width(label_font, c) for c in CAPTIONS)
+    # Value is right-aligned at the panel edge and must clear the caption on its left
+    value_room = layout["visible_x_end"] - layout["sub_label"][0] - caption_width - 1
+    widest_stat = max(stats, key=lambda s: label_width(value_font, s))
+    # Memory and missing glyphs only count the strings this font would draw
+    all_text = "".join(names + (CAPTIONS if label_font is font else []) + (stats if value_font is font else []))
+    result = {
+        "font": font.name,
+        "value_font": value_font.name,
+        "label_font": label_font.name,
+        "load_ms": round(font.load_time * 1000, 1),
+        "glyph_bytes": font.glyph_bytes(all_text),
+        "missing": "".join(font.missing(all_text)),
+        "caption_width": caption_width,
+        "widest_stat": widest_stat,
+        "widest_stat_width": label_width(value_font, widest_stat),
+        "stat_room": value_room,
+        "names": [],
+    }
+    for name in names:
+        name_width = scroller_width(font, name)
+        frames = layout["visible_x_end"] - layout["left"] + name_width
+        result["names"].append({
+            "name": name,
+            "width": name_width,
+            "fits_window": name_width <= visible,
+            "scroll_frames": frames,
+            "scroll_seconds": round(frames * scroll_speed, 2),
+        })
+    return result
+
+
+def print_report(result, width, height):
+    layout = tile_layout(0, 0, width, height)
+    fits = "ok" if result["widest_stat_width"] <= result["stat_room"] else "TOO WIDE"
+    print(f"\n{result['font']}: loaded in {result['load_ms']} ms, ~{result['glyph_bytes']} bytes of glyphs")
+    if result["missing"]:
+        print(f"  missing glyphs: {result['missing']!r}")
+    print(f"  captions {result['caption_width']}px in {result['label_font']}, widest stat {result['widest_stat']!r} "
+          f"{result['widest_stat_width']}px in {result['value_font']} of {result['stat_room']}px ({fits})")
+    print(f"  scroll window x={layout['visible_x_start']}..{layout['visible_x_end']}")
+    for entry in result["names"]:
+        window = "fits window" if entry["fits_window"] else "scrolls"
+        print(f"    {entry['name']!r}: {entry['width']}px, {window}, "
+              f"{entry['scroll_frames']} frames ({entry['scroll_seconds']}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate BDF fonts for the YouTube stats display")
+    parser.add_argument("fonts", nargs="?", default="fonts", help="folder of .bdf fonts (default: fonts)")
+    parser.add_argument("--settings", nargs="*", default=None,
+                        help="settings.toml files to read CHANNEL_NAME entries from (default: settings.toml)")
+    parser.add_argument("--names", nargs="*", default=[], help="extra channel names to try")
+    parser.add_argument("--width", type=int, default=64, help="panel or tile width (default: 64)")
+    parser.add_argument("--height", type=int, default=32, help="panel or tile height (default: 32)")
+    parser.add_argument("--y-position", type=int, default=4, help="channel name y, as in code.py (default: 4)")
+    parser.add_argument("--scroll-speed", type=float, default=SCROLL_SPEED,
+                        help=f"seconds per scroll frame (default: {SCROLL_SPEED})")
+    parser.add_argument("--value-font", default=None,
+                        help='font for the numbers, or "test" for the font under test (default: <fonts>/helvB08.bdf)')
+    parser.add_argument("--label-font", default=None,
+                        help='font for "sub"/"view", or "test" for the font under test '
+                             '(default: <fonts>/Rockbox-Propfont.bdf)')
+    parser.add_argument("--scale", type=int, default=4, help="PNG pixels per LED (default: 4)")
+    parser.add_argument("--out", default="font_report", help="output folder (default: font_report)")
+    args = parser.parse_args()
+
+    settings_files = args.settings if args.settings is not None else ["settings.toml"]
+    names = []
+    for path in settings_files:
+        if os.path.exists(path):
+            names += channel_names_from(path)
+        else:
+            print(f"Skipping {path}: not found")
+    names += args.names
+    names = list(dict.fromkeys(names)) or ["YouTube.com/profgallaugher"]
+
+    font_paths = sorted(os.path.join(args.fonts, f) for f in os.listdir(args.fonts) if f.lower().endswith(".bdf"))
+    if not font_paths:
+        raise SystemExit(f"No .bdf fonts found in {args.fonts}")
+    os.makedirs(args.out, exist_ok=True)
+    # The same fonts code.py loads, unless told otherwise
+    value_path = args.value_font or os.path.join(args.fonts, "helvB08.bdf")
+    label_path = args.label_font or os.path.join(args.fonts, "Rockbox-Propfont.bdf")
+    fixed_value_font = None if value_path == "test" else BDFFont(value_path)
+    fixed_label_font = None if label_path == "test" else BDFFont(label_path)
+
+    rows = []
+    for path in font_paths:
+        font = BDFFont(path)
+        value_font = fixed_value_font or font
+        label_font = fixed_label_font or font
+        result = evaluate(font, value_font, label_font, names, args.width, args.height, args.scroll_speed)
+        print_report(result, args.width, args.height)
+        sheet_path = os.path.join(args.out, os.path.splitext(font.name)[0] + ".png")
+        contact_sheet(font, value_font, label_font, names, args.width, args.height, args.y_position,
+                      args.scale).save_png(sheet_path)
+        print(f"  contact sheet: {sheet_path}")
+        for entry in result["names"]:
+            rows.append([result["font"], result["value_font"], result["label_font"], result["load_ms"],
+                         result["glyph_bytes"], result["missing"],
+                         result["widest_stat_width"], result["stat_room"], entry["name"], entry["width"],
+                         entry["fits_window"], entry["scroll_frames"], entry["scroll_seconds"]])
+
+    report_path = os.path.join(args.out, "report.csv")
+    with open(report_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["font", "value_font", "label_font", "load_ms", "glyph_bytes", "missing_glyphs", "widest_stat_px", "stat_room_px",
+                         "channel_name", "name_px", "fits_window", "scroll_frames", "scroll_seconds"])
+        writer.writerows(rows)
+    print(f"\nWrote {report_path} ({len(font_paths)} fonts x {len(names)} names)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 # This code can be used to quickly test fonts, replacing names for various fonts.
 # I created this so I didn't have to wait for the networking before I saw fonts.
+# To compare many fonts at once on a computer (no board needed), use font_eval.py instead.
 import board
 import time
 import terminalio
@@ -21,54 +22,67 @@ VIEW_COUNT = "757,696"
 # Create a display group for our screen objects
 main_group = displayio.Group()
 
-# YouTube logo colors
-youtube_red = 0xFC0D1B  # YouTube red color
-
-# Create a bitmap for the logo (13x9 pixels) - adjusted for symmetry
-logo_bitmap = displayio.Bitmap(13, 9, 2)
-logo_palette = displayio.Palette(2)
-logo_palette[0] = 0x000000  # Black background/transparent
-logo_palette[1] = youtube_red  # YouTube red
-
-# Draw the YouTube rounded rectangle with rounded corners
-for x in range(13):
-    for y in range(9):
-        # Fill rectangle with red but make corners rounded
-        if ((x == 0 and y == 0) or  # Top-left corner
-                (x == 0 and y == 8) or  # Bottom-left corner
-                (x == 12 and y == 0) or  # Top-right corner
-                (x == 12 and y == 8)):  # Bottom-right corner
-            logo_bitmap[x, y] = 0  # Make corners transparent/black
-        else:
-            logo_bitmap[x, y] = 1  # Fill the rest with red
-
-# Draw the white play triangle
-# Create a bitmap for the play button with symmetric positioning
-play_bitmap = displayio.Bitmap(5, 5, 2)
-play_palette = displayio.Palette(2)
-play_palette[0] = 0x000000  # Transparent/Black
-play_palette[1] = 0xFFFFFF  # White
-
-# Draw a simple triangle for the play button
-play_bitmap[1, 0] = 1
-play_bitmap[1, 1] = 1
-play_bitmap[1, 2] = 1
-play_bitmap[1, 3] = 1
-play_bitmap[1, 4] = 1
-play_bitmap[2, 1] = 1
-play_bitmap[2, 2] = 1
-play_bitmap[2, 3] = 1
-play_bitmap[3, 2] = 1
-
-# Create TileGrid objects for the logo and play button
-# Logo moved up 1 pixel (from y=2 to y=1)
-logo_grid = displayio.TileGrid(logo_bitmap, pixel_shader=logo_palette, x=1, y=1)
-# Play button also moved up 1 pixel (from y=4 to y=3)
-play_grid = displayio.TileGrid(play_bitmap, pixel_shader=play_palette, x=5, y=3)
-
-# Add the YouTube logo and play button to the main group
-main_group.append(logo_grid)
-main_group.append(play_grid)
+# YouTube logo: tile 0 of the sprite sheet built by make_sprites.py (logo with the play glyph).
+# Captions stay as Labels here, since trying label fonts is what this script is for.
+SPRITE_LOGO = 0
+SPRITE_COUNT = 3  # Tiles in sprites.bmp, as in code.py
+try:
+    import adafruit_imageload
+    sprite_sheet, sprite_palette = adafruit_imageload.load("/sprites.bmp", bitmap=displayio.Bitmap,
+                                                           palette=displayio.Palette)
+    logo_grid = displayio.TileGrid(sprite_sheet, pixel_shader=sprite_palette, tile_width=sprite_sheet.width // SPRITE_COUNT,
+                                   tile_height=sprite_sheet.height, default_tile=SPRITE_LOGO, x=1, y=1)
+    main_group.append(logo_grid)
+except Exception as e:
+    print(f"Sprite sheet unavailable ({e}), drawing the logo instead")
+    # YouTube logo colors
+    youtube_red = 0xFC0D1B  # YouTube red color
+
+    # Create a bitmap for the logo (13x9 pixels) - adjusted for symmetry
+    logo_bitmap = displayio.Bitmap(13, 9, 2)
+    logo_palette = displayio.Palette(2)
+    logo_palette[0] = 0x000000  # Black background/transparent
+    logo_palette[1] = youtube_red  # YouTube red
+
+    # Draw the YouTube rounded rectangle with rounded corners
+    for x in range(13):
+        for y in range(9):
+            # Fill rectangle with red but make corners rounded
+            if ((x == 0 and y == 0) or  # Top-left corner
+                    (x == 0 and y == 8) or  # Bottom-left corner
+                    (x == 12 and y == 0) or  # Top-right corner
+                    (x == 12 and y == 8)):  # Bottom-right corner
+                logo_bitmap[x, y] = 0  # Make corners transparent/black
+            else:
+                logo_bitmap[x, y] = 1  # Fill the rest with red
+
+    # Draw the white play triangle
+    # Create a bitmap for the play button with symmetric positioning
+    play_bitmap = displayio.Bitmap(5, 5, 2)
+    play_palette = displayio.Palette(2)
+    play_palette[0] = 0x000000  # Transparent/Black
+    play_palette[1] = 0xFFFFFF  # White
+
+    # Draw a simple triangle for the play button
+    play_bitmap[1, 0] = 1
+    play_bitmap[1, 1] = 1
+    play_bitmap[1, 2] = 1
+    play_bitmap[1, 3] = 1
+    play_bitmap[1, 4] = 1
+    play_bitmap[2, 1] = 1
+    play_bitmap[2, 2] = 1
+    play_bitmap[2, 3] = 1
+    play_bitmap[3, 2] = 1
+
+    # Create TileGrid objects for the logo and play button
+    # Logo moved up 1 pixel (from y=2 to y=1)
+    logo_grid = displayio.TileGrid(logo_bitmap, pixel_shader=logo_palette, x=1, y=1)
+    # Play button also moved up 1 pixel (from y=4 to y=3)
+    play_grid = displayio.TileGrid(play_bitmap, pixel_shader=play_palette, x=5, y=3)
+
+    # Add the YouTube logo and play button to the main group
+    main_group.append(logo_grid)
+    main_group.append(play_grid)
 
 # Channel name
 channel_name = "YouTube.com/profgallaugher"
@@ -0,0 +1,100 @@
+# make_sprites.py - bakes the static graphics into one indexed BMP sprite sheet.
+# Run on your computer (Python 3, no extra packages), then copy sprites.bmp to the CIRCUITPY board:
+#
+#   python make_sprites.py                                   # uses fonts/Rockbox-Propfont.bdf
+#   python make_sprites.py --font fonts/helvB08.bdf --out sprites.bmp
+#
+# The sheet is one row of equal-size tiles sharing a 4-colour palette:
+#   tile 0 - YouTube logo with the play glyph
+#   tile 1 - "sub" caption
+#   tile 2 - "view" caption
+# Palette: 0 background, 1 YouTube red, 2 white, 3 caption ink.
+# The boards recolour captions by changing palette entry 3, so the ink colour here is only a default.
+# Captions are drawn so that a tile placed at y = label_y - tile_height // 2 lines up exactly
+# with a Label at label_y, the way code.py used to place them.
+
+import argparse
+import struct
+
+from font_eval import BDFFont, text_extent
+from panel_layout import LOGO_WIDTH, LOGO_HEIGHT, logo_pixels
+
+CAPTIONS = ["sub", "view"]
+
+BACKGROUND = 0
+CAPTION_INK = 3  # 1 and 2 are panel_layout's LOGO_RED and LOGO_WHITE
+PALETTE = [0x000000, 0xFC0D1B, 0xFFFFFF, 0xFFFFFF]
+
+
+def tile_size(font):
+    """Smallest tile that fits the logo and every caption centred on the font's ascent."""
+    width = LOGO_WIDTH
+    above = below = 0
+    for caption in CAPTIONS:
+        left, right, top, bottom = text_extent(font, caption)
+        width = max(width, right)
+        # Rows above and below the label's y, which sits ascent // 2 above the baseline
+        above = max(above, -top - font.ascent // 2)
+        below = max(below, bottom + font.ascent // 2)
+    height = LOGO_HEIGHT
+    while height // 2 < above or height - height // 2 < below:
+        height += 1
+    return width, height
+
+
+def build_sheet(font):
+    width, height = tile_size(font)
+    tiles = 1 + len(CAPTIONS)
+    sheet = [[BACKGROUND] * (width * tiles) for _ in range(height)]
+
+    for x, y, color in logo_pixels():
+        sheet[y][x] = color
+
+    baseline = height // 2 + font.ascent // 2
+    for i, caption in enumerate(CAPTIONS):
+        x = (i + 1) * width
+        for c in caption:
+            g = font.glyphs.get(c)
+            if g is None:
+                continue
+            top = baseline - g.height - g.dy
+            for gy in range(g.height):
+                for gx in range(g.width):
+                    if g.pixel(gx, gy):
+                        sheet[top + gy][x + g.dx + gx] = CAPTION_INK
+            x += g.shift_x
+    return sheet, width, height
+
+
+def write_bmp(path, sheet, palette):
+    """8-bit indexed, uncompressed BMP - what adafruit_imageload reads fastest."""
+    height = len(sheet)
+    width = len(sheet[0])
+    stride = (width + 3) // 4 * 4
+    palette_bytes = b"".join(struct.pack("<BBBB", c & 0xFF, (c >> 8) & 0xFF, (c >> 16) & 0xFF, 0) for c in palette)
+    offset = 14 + 40 + len(palette_bytes)
+    pixels = b"".join(bytes(row) + b"\x00" * (stride - width) for row in reversed(sheet))
+    with open(path, "wb") as f:
+        f.write(struct.pack("<2sIHHI", b"BM", offset + len(pixels), 0, 0, offset))
+        f.write(struct.pack("<IiiHHIIiiII", 40, width, height, 1, 8, 0, len(pixels), 2835, 2835,
+                            len(palette), len(palette)))
+        f.write(palette_bytes)
+        f.write(pixels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the sprite sheet for the YouTube stats display")
+    parser.add_argument("--font", default="fonts/Rockbox-Propfont.bdf",
+                        help="BDF font for the captions (default: fonts/Rockbox-Propfont.bdf)")
+    parser.add_argument("--out", default="sprites.bmp", help="output file (default: sprites.bmp)")
+    args = parser.parse_args()
+
+    sheet, width, height = build_sheet(BDFFont(args.font))
+    write_bmp(args.out, sheet, PALETTE)
+    print(f"Wrote {args.out}: {1 + len(CAPTIONS)} tiles of {width}x{height}")
+    for row in sheet:
+        print("".join(" #*o"[v] for v in row))
+
+
+if __name__ == "__main__":
+    main()
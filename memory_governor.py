@@ -0,0 +1,81 @@
+# memory_governor.py - schedules garbage collection between frames and backs off when memory runs low.
+# Copy this file to the CIRCUITPY board next to code.py.
+#
+# CircuitPython collects garbage whenever an allocation doesn't fit, which can land in the middle
+# of a scroll and show up as a hitch. Calling idle() at quiet moments (the pause at the end of a
+# scroll, right after a fetch) does the collecting there instead, so the heap rarely fills mid-frame.
+#
+# After each collection gc.mem_free() is compared with two thresholds from settings.toml:
+#   GC_LOW_MEMORY      - below this, take the next degrade step (default 16384 bytes)
+#   GC_CRITICAL_MEMORY - below this, take every remaining step at once (default 6144 bytes)
+# The steps, in order:
+#   "skip fades"     - channel switches cut straight over instead of fading
+#   "shrink caches"  - drop the glyphs the fonts have cached; they are reloaded from flash when needed
+#   "single channel" - show one channel on one tile, like code.py
+# Steps are never undone while running; a reset starts fresh.
+
+import gc
+import os
+
+STEPS = ("skip fades", "shrink caches", "single channel")
+
+
+class MemoryGovernor:
+    def __init__(self, fonts=(), steps=STEPS):
+        self.fonts = fonts
+        self.steps = steps
+        self.taken = []
+        self.low = int(os.getenv("GC_LOW_MEMORY") or "16384")
+        self.critical = int(os.getenv("GC_CRITICAL_MEMORY") or "6144")
+        self.collections = 0
+        self.memory_errors = 0
+        gc.collect()
+        print(f"Memory: {gc.mem_free()} bytes free at start, low={self.low}, critical={self.critical}")
+
+    @property
+    def fades(self):
+        return "skip fades" not in self.taken
+
+    @property
+    def single_channel(self):
+        return "single channel" in self.taken
+
+    def idle(self, reason):
+        """Collect now, while nothing is moving, and degrade if memory is still tight. Returns bytes free."""
+        gc.collect()
+        self.collections += 1
+        free = gc.mem_free()
+        if free < self.critical:
+            print(f"Memory: {free} bytes free after {reason}, below critical {self.critical}")
+            while self.degrade():
+                pass
+        elif free < self.low:
+            print(f"Memory: {free} bytes free after {reason}, below low {self.low}")
+            self.degrade()
+        return free
+
+    def memory_error(self):
+        """Call from an except MemoryError handler: free what we can and step down right away."""
+        self.memory_errors += 1
+        gc.collect()
+        print(f"Memory: MemoryError, {gc.mem_free()} bytes free after collecting")
+        self.degrade()
+
+    def degrade(self):
+        """Take the next step not yet taken. Returns False when there is nothing left to give up."""
+        for step in self.steps:
+            if step not in self.taken:
+                self.taken.append(step)
+                if step == "shrink caches":
+                    self.shrink_caches()
+                gc.collect()
+                print(f"Memory: degrade step '{step}', {gc.mem_free()} bytes free now")
+                return True
+        return False
+
+    def shrink_caches(self):
+        for font in self.fonts:
+            # adafruit_bitmap_font keeps every glyph it has loaded; labels hold on to the ones on screen
+            glyphs = getattr(font, "_glyphs", None)
+            if glyphs:
+                glyphs.clear()
@@ -2,10 +2,14 @@
 # This code will not work with a MatrixPortal M4 (not enough memory)
 # Use the file format for settings.toml you'll find in multi-channel-settings.toml in the github repo, just be sure to rename it settings.toml on your CIRCUITPY board.
 
-import board, time, terminalio, displayio, os
+import board, time, terminalio, displayio, os, errno, json
 from adafruit_matrixportal.matrixportal import MatrixPortal
 from adafruit_display_text.label import Label
 from adafruit_bitmap_font import bitmap_font
+from network_transport import make_transport, LiveTransport
+from memory_governor import MemoryGovernor
+from display_schedule import Schedule, dim
+from panel_layout import LOGO_WIDTH, LOGO_HEIGHT, LOGO_RED, LOGO_WHITE, logo_pixels, pick_bit_depth, tile_layout
 
 # === CONFIG ===
 DEFAULT_SUBS = 300
@@ -21,10 +25,31 @@ NORMAL_COLOR = 0xFFFFFF
 WIFI_RETRY_INTERVAL = 10
 ERROR_RETRY_INTERVAL = 30
 NORMAL_REFRESH_INTERVAL = 5 * 60
+STALE_AFTER_POLLS = 3  # STATS_SERVER stats older than this many of the server's polls count as a failed fetch
 CHAR_SPACING = 1
 FADE_STEPS = 10
 FADE_DELAY = 0.03
 
+API_HOST = "www.googleapis.com"
+MAX_IDS_PER_REQUEST = 50
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY") or "4")  # API keys fetched at the same time
+FETCH_TIMEOUT = int(os.getenv("FETCH_TIMEOUT") or "10")  # Seconds before one key's request is given up
+FETCH_CONNECT_TIMEOUT = int(os.getenv("FETCH_CONNECT_TIMEOUT") or "3")  # Seconds one key may spend connecting
+
+YOUTUBE_RED = 0xFC0D1B
+
+# === Panel size ===
+# Chained panels: e.g. MATRIX_WIDTH = 128 for two 64x32 side by side, add MATRIX_TILE_ROWS = 2 for a 2x2 stack.
+# Each TILE_WIDTH x TILE_HEIGHT area of the panel shows its own channel.
+MATRIX_WIDTH = int(os.getenv("MATRIX_WIDTH") or "64")
+MATRIX_HEIGHT = int(os.getenv("MATRIX_HEIGHT") or "32")
+MATRIX_TILE_ROWS = int(os.getenv("MATRIX_TILE_ROWS") or "1")
+TILE_WIDTH = int(os.getenv("TILE_WIDTH") or "64")
+TILE_HEIGHT = int(os.getenv("TILE_HEIGHT") or "32")
+
+# Optional LAN aggregator (stats_server.py), e.g. "http://192.168.1.20:8080". No API keys needed then.
+STATS_SERVER = os.getenv("STATS_SERVER")
+
 # === Load multiple channels ===
 channels = []
 index = 1
@@ -35,7 +60,7 @@ while True:
     channel_name = os.getenv(f"CHANNEL_NAME{suffix}")
     sub_adjust = int(os.getenv(f"SUB_ADJUST{suffix}") or "0")
     view_adjust = int(os.getenv(f"VIEW_ADJUST{suffix}") or "0")
-    if not api_key or not channel_id or not channel_name:
+    if (not api_key and not STATS_SERVER) or not channel_id or not channel_name:
         break
     channels.append({
         "api_key": api_key,
@@ -48,34 +73,41 @@ while True:
 if not channels:
     raise ValueError("No YouTube channels found in settings.toml")
 
+# === Colours ===
+def fade_colors():
+    return [int((i / FADE_STEPS) * 255) * 0x010101 for i in range(FADE_STEPS + 1)]
+
+# === Schedule ===
+schedule = Schedule()
+
 # === MatrixPortal Setup ===
-matrixportal = MatrixPortal(status_neopixel=board.NEOPIXEL, bit_depth=6, debug=True)
-display_width = matrixportal.graphics.display.width
-visible_x_start = 15
-visible_x_end = display_width
+base_colors = [0x000000, YOUTUBE_RED, NORMAL_COLOR, FALLBACK_COLOR, ERROR_COLOR]
+bit_depth = int(os.getenv("BIT_DEPTH") or "0") or pick_bit_depth(
+    base_colors + fade_colors() + [dim(color, level) for level in schedule.levels() for color in base_colors])
+print(f"MatrixPortal {MATRIX_WIDTH}x{MATRIX_HEIGHT}, bit_depth={bit_depth}")
+matrixportal = MatrixPortal(status_neopixel=board.NEOPIXEL, bit_depth=bit_depth, width=MATRIX_WIDTH,
+                            height=MATRIX_HEIGHT, tile_rows=MATRIX_TILE_ROWS, debug=True)
+display = matrixportal.graphics.display
+transport = make_transport(matrixportal.network)
+# Concurrent fetches need the S3's native sockets and a live network (record/replay/faults go through transport)
+socket_pool = None
+try:
+    if isinstance(transport, LiveTransport) and not STATS_SERVER:
+        import socketpool, ssl, wifi
+        socket_pool = socketpool.SocketPool(wifi.radio)
+        ssl_context = ssl.create_default_context()
+except ImportError:
+    print("No native sockets, fetching one API key at a time")
 main_group = displayio.Group()
-matrixportal.graphics.display.root_group = main_group
-
-# === YouTube Logo ===
-youtube_red = 0xFC0D1B
-logo_bitmap = displayio.Bitmap(13, 9, 2)
-logo_palette = displayio.Palette(2)
-logo_palette[0] = 0x000000
-logo_palette[1] = youtube_red
-for x in range(13):
-    for y in range(9):
-        if ((x == 0 and y == 0) or (x == 0 and y == 8) or (x == 12 and y == 0) or (x == 12 and y == 8)):
-            logo_bitmap[x, y] = 0
-        else:
-            logo_bitmap[x, y] = 1
-play_bitmap = displayio.Bitmap(5, 5, 2)
-play_palette = displayio.Palette(2)
-play_palette[0] = youtube_red
-play_palette[1] = 0xFFFFFF
-for x, y in [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (2, 1), (2, 2), (2, 3), (3, 2)]:
-    play_bitmap[x, y] = 1
-main_group.append(displayio.TileGrid(logo_bitmap, pixel_shader=logo_palette, x=1, y=1))
-main_group.append(displayio.TileGrid(play_bitmap, pixel_shader=play_palette, x=5, y=3))
+display.root_group = main_group
+
+# One tile per channel, as many as fit on the panel.
+tile_layouts = []
+for tile_y in range(0, display.height - TILE_HEIGHT + 1, TILE_HEIGHT):
+    for tile_x in range(0, display.width - TILE_WIDTH + 1, TILE_WIDTH):
+        tile_layouts.append(tile_layout(tile_x, tile_y, TILE_WIDTH, TILE_HEIGHT))
+tile_layouts = tile_layouts[:len(channels)] or [tile_layout(0, 0, display.width, display.height)]
+print(f"Showing {len(tile_layouts)} channel tile(s) at once")
 
 # === Fonts ===
 try:
@@ -96,18 +128,78 @@ try:
     label_font = bitmap_font.load_font("/fonts/Rockbox-Propfont.bdf")
 except:
     label_font = terminalio.FONT
+governor = MemoryGovernor(fonts=(channel_font, subs_value_font, views_value_font, label_font))
+
+# === Static Graphics ===
+# The logo and the "sub"/"view" captions come from one sprite sheet with a shared palette,
+# loaded in one read. Build it with make_sprites.py and copy sprites.bmp to the board.
+SPRITE_LOGO = 0
+SPRITE_SUB = 1
+SPRITE_VIEW = 2
+SPRITE_COUNT = 3
+CAPTION_INK = 3  # Palette entry the captions are drawn in: 0 background, 1 YouTube red, 2 white
+try:
+    import adafruit_imageload
+    sprite_sheet, sprite_palette = adafruit_imageload.load("/sprites.bmp", bitmap=displayio.Bitmap, palette=displayio.Palette)
+    sprite_width = sprite_sheet.width // SPRITE_COUNT
+    sprite_height = sprite_sheet.height
+    sprite_captions = True
+except Exception as e:
+    # No sprite sheet or no adafruit_imageload: draw the logo here and use Labels for the captions
+    print("Sprite sheet unavailable:", e)
+    sprite_width = LOGO_WIDTH
+    sprite_height = LOGO_HEIGHT
+    sprite_sheet = displayio.Bitmap(LOGO_WIDTH, LOGO_HEIGHT, 4)
+    sprite_palette = displayio.Palette(4)
+    sprite_palette[0] = 0x000000
+    sprite_palette[LOGO_RED] = YOUTUBE_RED
+    sprite_palette[LOGO_WHITE] = 0xFFFFFF
+    for x, y, color in logo_pixels():
+        sprite_sheet[x, y] = color
+    sprite_captions = False
+sprite_palette[CAPTION_INK] = NORMAL_COLOR
+
+def sprite(tile_index, x, y):
+    return displayio.TileGrid(sprite_sheet, pixel_shader=sprite_palette, tile_width=sprite_width, tile_height=sprite_height, default_tile=tile_index, x=x, y=y)
+
+# === Tiles ===
+def make_tile(layout, channel_index):
+    group = displayio.Group()
+    group.append(sprite(SPRITE_LOGO, layout["logo"][0], layout["logo"][1]))
+    if sprite_captions:
+        # Caption tiles are centred on the same y a Label would use
+        group.append(sprite(SPRITE_SUB, layout["sub_label"][0], layout["sub_label"][1] - sprite_height // 2))
+        group.append(sprite(SPRITE_VIEW, layout["views_label"][0], layout["views_label"][1] - sprite_height // 2))
+        caption_labels = []
+    else:
+        caption_labels = [
+            Label(label_font, text="sub", color=NORMAL_COLOR, x=layout["sub_label"][0], y=layout["sub_label"][1]),
+            Label(label_font, text="view", color=NORMAL_COLOR, x=layout["views_label"][0], y=layout["views_label"][1]),
+        ]
+        for label in caption_labels:
+            group.append(label)
+    tile = {
+        "group": group,
+        "layout": layout,
+        "channel_index": channel_index,
+        "caption_labels": caption_labels,
+        "sub_value": Label(subs_value_font, text="", color=NORMAL_COLOR, anchored_position=layout["sub_value"], anchor_point=(1.0, 0.5)),
+        "views_value": Label(views_value_font, text="", color=NORMAL_COLOR, anchored_position=layout["views_value"], anchor_point=(1.0, 0.5)),
+        "scrolling_chars_group": displayio.Group(),
+        "char_labels": [],
+        "text_pixel_width": 0,
+        "scroll_x": layout["visible_x_end"],
+        "pause_at_end": False,
+        "pause_start_time": 0,
+        "last_scroll_time": 0,
+        "scroll_cycles": 0,
+    }
+    for key in ("sub_value", "views_value", "scrolling_chars_group"):
+        group.append(tile[key])
+    main_group.append(group)
+    return tile
 
-# === Labels ===
-sub_label = Label(label_font, text="sub", color=NORMAL_COLOR, x=2, y=14)
-sub_value = Label(subs_value_font, text="", color=NORMAL_COLOR, anchored_position=(64, 16), anchor_point=(1.0, 0.5))
-views_label = Label(label_font, text="view", color=NORMAL_COLOR, x=2, y=25)
-views_value = Label(views_value_font, text="", color=NORMAL_COLOR, anchored_position=(64, 27), anchor_point=(1.0, 0.5))
-main_group.append(sub_label)
-main_group.append(sub_value)
-main_group.append(views_label)
-main_group.append(views_value)
-scrolling_chars_group = displayio.Group()
-main_group.append(scrolling_chars_group)
+tiles = [make_tile(layout, i) for i, layout in enumerate(tile_layouts)]
 
 # === Functions ===
 def format_stat(value):
@@ -120,128 +212,378 @@ def format_stat(value):
     else:
         return f"{value:,}"
 
-def show_stats(subs, views, color):
-    # sub_label.color = sub_value.color = views_label.color = views_value.color = color
-    sub_label.color = sub_value.color = views_label.color = views_value.color = (0, 0, 0)
-    sub_value.text = format_stat(subs)
-    views_value.text = format_stat(views)
+def set_tile_color(tile, color):
+    # Captions share one palette entry across tiles, so every tile's captions follow the last colour set
+    sprite_palette[CAPTION_INK] = color
+    for label in tile["caption_labels"]:
+        label.color = color
+    tile["sub_value"].color = tile["views_value"].color = color
 
-def scroll_label_setup(name):
+def show_stats(tile, subs, views, color):
+    # set_tile_color(tile, color)
+    set_tile_color(tile, (0, 0, 0))
+    tile["sub_value"].text = format_stat(subs)
+    tile["views_value"].text = format_stat(views)
+
+def scroll_label_setup(tile, name):
+    char_labels = tile["char_labels"]
+    scrolling_chars_group = tile["scrolling_chars_group"]
     char_labels.clear()
     while scrolling_chars_group:
         scrolling_chars_group.pop()
     x_offset = 0
     for c in name:
-        label = Label(channel_font, text=c, color=NORMAL_COLOR)
-        label.y = y_position
+        label = Label(channel_font, text=c, color=dim(NORMAL_COLOR, brightness))
+        label.y = tile["layout"]["top"] + y_position
         width = label.bounding_box[2]
         char_labels.append((label, x_offset))
         x_offset += width + CHAR_SPACING
+    tile["text_pixel_width"] = x_offset
+    tile["scroll_x"] = tile["layout"]["visible_x_end"]
+    tile["pause_at_end"] = False
+    tile["scroll_cycles"] = 0
     return x_offset
 
-def fetch_stats_for(channel):
-    api_url = f"https://www.googleapis.com/youtube/v3/channels?part=statistics&id={channel['channel_id']}&key={channel['api_key']}"
+def scroll_tile(tile, now):
+    """Move one tile's name one step; returns True when the name has just scrolled off."""
+    visible_x_start = tile["layout"]["visible_x_start"]
+    visible_x_end = tile["layout"]["visible_x_end"]
+    if not tile["pause_at_end"] and now - tile["last_scroll_time"] >= scroll_speed:
+        tile["scroll_x"] -= 1
+        scroll_x = tile["scroll_x"]
+        scrolling_chars_group = tile["scrolling_chars_group"]
+        while scrolling_chars_group:
+            scrolling_chars_group.pop()
+        for label, char_x in tile["char_labels"]:
+            screen_x = char_x + scroll_x
+            if visible_x_start <= screen_x < visible_x_end:
+                label.x = screen_x
+                scrolling_chars_group.append(label)
+        # scroll_x is a screen x, so the name is gone once it is text_pixel_width left of the tile
+        if scroll_x <= tile["layout"]["left"] - tile["text_pixel_width"]:
+            tile["pause_at_end"] = True
+            tile["pause_start_time"] = now
+            tile["scroll_cycles"] += 1
+            tile["last_scroll_time"] = now
+            return True
+        tile["last_scroll_time"] = now
+    elif tile["pause_at_end"] and now - tile["pause_start_time"] >= SCROLL_RESET_PAUSE:
+        tile["scroll_x"] = visible_x_end
+        tile["pause_at_end"] = False
+        tile["last_scroll_time"] = now
+    return False
+
+# === Fetching ===
+# Latest raw stats per channel id, (subscribers, views). Tiles read from here; refresh_stats() fills it.
+stats_table = {}
+
+def key_batches(selected):
+    """Channels grouped by API key: channels on one key share a request (the API takes up to 50 ids)."""
+    by_key = {}
+    for channel in selected:
+        batch = by_key.setdefault(channel["api_key"], [])
+        if channel["channel_id"] not in [c["channel_id"] for c in batch]:
+            batch.append(channel)
+    batches = []
+    for batch in by_key.values():
+        for i in range(0, len(batch), MAX_IDS_PER_REQUEST):
+            batches.append(batch[i:i + MAX_IDS_PER_REQUEST])
+    return batches
+
+def api_path(batch):
+    ids = ",".join(channel["channel_id"] for channel in batch)
+    return f"/youtube/v3/channels?part=statistics&id={ids}&key={batch[0]['api_key']}"
+
+def store_stats(data):
+    if "error" in data:
+        # e.g. a 403 quotaExceeded that came back without a status code
+        raise ValueError(data["error"].get("message", "error response"))
+    for item in data.get("items", []):
+        stats = item["statistics"]
+        stats_table[item["id"]] = (int(stats.get("subscriberCount", "0")), int(stats.get("viewCount", "0")))
+
+def fetch_one_by_one(batches):
+    """One blocking request per batch through the transport (also what record/replay/faults use)."""
+    for batch in batches:
+        try:
+            print("Fetching stats for:", ", ".join(channel['channel_name'] for channel in batch))
+            response = transport.fetch(f"https://{API_HOST}{api_path(batch)}")
+            status = getattr(response, "status_code", 200)
+            if status != 200:
+                raise ValueError(f"HTTP {status}")
+            store_stats(response.json() if hasattr(response, 'json') else response)
+        except Exception as e:
+            print("API error:", e)
+            if isinstance(e, MemoryError):
+                governor.memory_error()
+
+def fetch_concurrently(batches):
+    """Keep up to FETCH_CONCURRENCY requests in flight on the S3's native sockets.
+
+    The TLS handshake blocks in CircuitPython's ssl module, so connections still open one after
+    another and a refresh pays one handshake per key. Only the wait for the API's response overlaps:
+    each request is sent as soon as its connection is up and the replies are read with non-blocking
+    sockets. A key that can't connect within FETCH_CONNECT_TIMEOUT holds the others up for at most
+    that long; a reply that takes longer than FETCH_TIMEOUT overall is dropped.
+    """
+    pending = list(batches)
+    in_flight = []
+    buffer = bytearray(1024)
+    while pending or in_flight:
+        while pending and len(in_flight) < FETCH_CONCURRENCY:
+            batch = pending.pop(0)
+            print("Requesting stats for:", ", ".join(channel['channel_name'] for channel in batch))
+            sock = None
+            started = time.monotonic()
+            try:
+                sock = ssl_context.wrap_socket(socket_pool.socket(socket_pool.AF_INET, socket_pool.SOCK_STREAM), server_hostname=API_HOST)
+                sock.settimeout(FETCH_CONNECT_TIMEOUT)
+                sock.connect((API_HOST, 443))
+                # HTTP/1.0 so the reply is the plain body up to the close, never chunked
+                message = memoryview(f"GET {api_path(batch)} HTTP/1.0\r\nHost: {API_HOST}\r\n\r\n".encode())
+                while message:
+                    message = message[sock.send(message):]
+                sock.settimeout(0)
+                in_flight.append({"batch": batch, "sock": sock, "reply": bytearray(), "started": started})
+            except Exception as e:
+                print("API error:", e)
+                if isinstance(e, MemoryError):
+                    governor.memory_error()
+                if sock:
+                    sock.close()
+        for request in in_flight[:]:
+            finished = False
+            try:
+                received = request["sock"].recv_into(buffer)
+                if received:
+                    request["reply"].extend(memoryview(buffer)[:received])
+                else:
+                    finished = True
+            except OSError as e:
+                if e.errno != errno.EAGAIN:
+                    print("API error:", e)
+                    request["reply"] = None
+                    finished = True
+            if not finished and time.monotonic() - request["started"] > FETCH_TIMEOUT:
+                print("API timeout for:", ", ".join(channel['channel_name'] for channel in request["batch"]))
+                request["reply"] = None
+                finished = True
+            if finished:
+                request["sock"].close()
+                in_flight.remove(request)
+                if request["reply"]:
+                    parse_reply(request["reply"])
+        time.sleep(0.005)
+
+def parse_reply(reply):
     try:
-        print("Fetching stats for:", channel['channel_name'])
-        response = matrixportal.network.fetch(api_url)
-        data = response.json() if hasattr(response, 'json') else response
-        stats = data['items'][0]['statistics']
-        subs = int(stats.get("subscriberCount", "0")) + channel.get("sub_adjust", 0)
-        views = int(stats.get("viewCount", "0")) + channel.get("view_adjust", 0)
-        show_stats(subs, views, NORMAL_COLOR)
-        return True
+        reply = bytes(reply)
+        header_end = reply.find(b"\r\n\r\n")
+        status = int(reply[:header_end].split(b" ")[1])
+        if status != 200:
+            raise ValueError(f"HTTP {status}")
+        store_stats(json.loads(reply[header_end + 4:].decode()))
     except Exception as e:
         print("API error:", e)
-        show_stats(DEFAULT_SUBS, DEFAULT_VIEWS, ERROR_COLOR)
-        return False
+        if isinstance(e, MemoryError):
+            governor.memory_error()
+
+def fetch_from_stats_server():
+    """One GET /stats for every channel; stats_server.py answers one CSV line per channel, no JSON to parse."""
+    try:
+        response = transport.fetch(f"{STATS_SERVER}/stats")
+        if response.status_code != 200:
+            raise ValueError(f"Stats server returned {response.status_code}")
+        wanted = set(channel["channel_id"] for channel in channels)
+        for line in response.text.splitlines():
+            # channel_id,subscribers,views,age_seconds,interval_seconds
+            fields = line.split(",")
+            if fields[0] not in wanted:
+                continue
+            wanted.remove(fields[0])
+            if int(fields[3]) > STALE_AFTER_POLLS * int(fields[4]):
+                print(f"Stats server error: stats for {fields[0]} are stale ({fields[3]}s old)")
+                continue
+            stats_table[fields[0]] = (int(fields[1]), int(fields[2]))
+        if wanted:
+            print("Stats server has no stats for:", ", ".join(wanted))
+    except Exception as e:
+        print("Stats server error:", e)
+        if isinstance(e, MemoryError):
+            governor.memory_error()
+
+def low_memory_fetch():
+    """After the single-channel step or any MemoryError, fetch only what is on screen, one request at a time."""
+    return governor.single_channel or governor.memory_errors > 0
+
+def reconnect_wifi():
+    """The native sockets don't reconnect Wi-Fi the way matrixportal.network.fetch() does, so check first."""
+    global last_wifi_attempt
+    now = time.monotonic()
+    if now - last_wifi_attempt < WIFI_RETRY_INTERVAL:
+        return
+    last_wifi_attempt = now
+    try:
+        if not transport.is_connected:
+            print("Reconnecting Wi-Fi...")
+            transport.connect()
+            print_network_info()
+    except Exception as e:
+        print("Wi-Fi error:", e)
 
-def fade_out():
+def refresh_stats():
+    """Fetch every channel once into stats_table (only the ones on screen when memory is low)."""
+    started = time.monotonic()
+    if low_memory_fetch():
+        on_screen = tiles[:1] if governor.single_channel else tiles
+        selected = [channels[tile["channel_index"]] for tile in on_screen]
+    else:
+        selected = channels
+    if STATS_SERVER:
+        fetch_from_stats_server()
+    elif socket_pool is not None and not low_memory_fetch():
+        reconnect_wifi()
+        fetch_concurrently(key_batches(selected))
+    else:
+        fetch_one_by_one(key_batches(selected))
+    print(f"Refreshed {len(selected)} channel(s) in {time.monotonic() - started:.2f}s")
+
+def show_tile_stats(tile):
+    """Show a tile's channel from stats_table; a channel never fetched shows the defaults."""
+    channel = channels[tile["channel_index"]]
+    if channel["channel_id"] in stats_table:
+        subs, views = stats_table[channel["channel_id"]]
+        show_stats(tile, subs + channel.get("sub_adjust", 0), views + channel.get("view_adjust", 0), NORMAL_COLOR)
+    else:
+        show_stats(tile, DEFAULT_SUBS, DEFAULT_VIEWS, ERROR_COLOR)
+
+def fade_out(tiles):
+    if not governor.fades:
+        return
     for i in range(FADE_STEPS, -1, -1):
-        brightness = int((i / FADE_STEPS) * 255)
-        color = (brightness, brightness, brightness)
-        sub_value.color = views_value.color = sub_label.color = views_label.color = color
+        level = int((i / FADE_STEPS) * 255 * brightness)
+        color = (level, level, level)
+        for tile in tiles:
+            set_tile_color(tile, color)
         time.sleep(FADE_DELAY)
 
-def fade_in():
+def fade_in(tiles):
+    if not governor.fades:
+        for tile in tiles:
+            set_tile_color(tile, dim(NORMAL_COLOR, brightness))
+        return
     for i in range(0, FADE_STEPS + 1):
-        brightness = int((i / FADE_STEPS) * 255)
-        color = (brightness, brightness, brightness)
-        sub_value.color = views_value.color = sub_label.color = views_label.color = color
+        level = int((i / FADE_STEPS) * 255 * brightness)
+        color = (level, level, level)
+        for tile in tiles:
+            set_tile_color(tile, color)
         time.sleep(FADE_DELAY)
 
-char_labels = []
-current_channel = 0
-scroll_x = visible_x_end
-pause_at_end = False
-pause_start_time = 0
-last_scroll_time = 0
-scroll_cycles = 0
+def fall_back_to_single_channel():
+    """Last memory degrade step: keep only the first tile, showing one channel."""
+    global tiles
+    for tile in tiles[1:]:
+        main_group.remove(tile["group"])
+    tiles = tiles[:1]
+    print(f"Single channel: {channels[tiles[0]['channel_index']]['channel_name']}")
+    governor.idle("single channel")
+
+def apply_schedule(rule):
+    """Set brightness, scroll speed and refresh cadence for a schedule rule (None means normal)."""
+    global brightness, scroll_speed, interval
+    brightness = rule["brightness"] if rule else 1.0
+    scroll_speed = (rule and rule["scroll"]) or SCROLL_SPEED
+    interval = (rule and rule["refresh"]) or NORMAL_REFRESH_INTERVAL
+    # The panel only supports on/off brightness, so dimming scales the colours instead
+    display.brightness = 1.0 if brightness > 0 else 0.0
+    sprite_palette[LOGO_RED] = dim(YOUTUBE_RED, brightness)
+    sprite_palette[LOGO_WHITE] = dim(0xFFFFFF, brightness)
+    for tile in tiles:
+        set_tile_color(tile, dim(NORMAL_COLOR, brightness))
+        for label, _ in tile["char_labels"]:
+            label.color = dim(NORMAL_COLOR, brightness)
+
+first_channel = 0
 last_api_refresh = 0
 interval = NORMAL_REFRESH_INTERVAL
+brightness = 1.0
+scroll_speed = SCROLL_SPEED
 last_wifi_attempt = 0
 
-channel = channels[current_channel]
-text_pixel_width = scroll_label_setup(channel['channel_name'])
+for tile in tiles:
+    scroll_label_setup(tile, channels[tile["channel_index"]]['channel_name'])
 
 # === Network Info ===
 def print_network_info():
     try:
-        if matrixportal.network.is_connected:
+        if transport.is_connected:
             print("IP:", matrixportal.network.ip_address)
     except:
         print("IP unavailable")
 
 try:
-    matrixportal.network.connect()
+    transport.connect()
     print("Connected to Wi-Fi")
     print_network_info()
 except Exception as e:
     print("Wi-Fi error:", e)
+schedule.sync_time(matrixportal.network)
 
 # Initial fetch
-fetch_stats_for(channel)
-fade_in()
+refresh_stats()
+for tile in tiles:
+    show_tile_stats(tile)
+fade_in(tiles)
 last_api_refresh = time.monotonic()
 
 # === Main Loop ===
 while True:
     now = time.monotonic()
 
+    # === Time-of-day Schedule ===
+    if schedule.check(now):
+        apply_schedule(schedule.active)
+        if schedule.ended:
+            # Catch up on what was missed while the window throttled polling
+            last_api_refresh = now - interval
+
     # === Scroll Text ===
-    if not pause_at_end and now - last_scroll_time >= SCROLL_SPEED:
-        scroll_x -= 1
-        while scrolling_chars_group:
-            scrolling_chars_group.pop()
-        for label, char_x in char_labels:
-            screen_x = char_x + scroll_x
-            if visible_x_start <= screen_x < visible_x_end:
-                label.x = screen_x
-                scrolling_chars_group.append(label)
-        if scroll_x <= -text_pixel_width:
-            pause_at_end = True
-            pause_start_time = now
-            scroll_cycles += 1
-        last_scroll_time = now
-    elif pause_at_end and now - pause_start_time >= SCROLL_RESET_PAUSE:
-        scroll_x = visible_x_end
-        pause_at_end = False
-        last_scroll_time = now
-
-    # === Switch Channel ===
-    if scroll_cycles >= CHANNEL_SWITCH_SCROLLS:
-        fade_out()
-        current_channel = (current_channel + 1) % len(channels)
-        channel = channels[current_channel]
-        text_pixel_width = scroll_label_setup(channel['channel_name'])
-        scroll_cycles = 0
-        print(f"Switching to: {channel['channel_name']}")
-        fetch_stats_for(channel)
-        fade_in()
-        last_api_refresh = now
+    # Nothing to draw while the panel is blanked
+    if brightness > 0:
+        for tile in tiles:
+            # With one tile nothing else moves during its SCROLL_RESET_PAUSE, so collect then
+            if scroll_tile(tile, now) and len(tiles) == 1:
+                governor.idle("scroll pause")
+
+    # === Switch Channels ===
+    # The first tile paces the rotation; only needed when there are more channels than tiles.
+    if len(channels) > len(tiles) and not governor.single_channel and tiles[0]["scroll_cycles"] >= CHANNEL_SWITCH_SCROLLS:
+        fade_out(tiles)
+        # The stats are dark between fades; a good time to collect
+        governor.idle("channel switch")
+        first_channel = (first_channel + len(tiles)) % len(channels)
+        for i, tile in enumerate(tiles):
+            tile["channel_index"] = (first_channel + i) % len(channels)
+            scroll_label_setup(tile, channels[tile["channel_index"]]['channel_name'])
+            print(f"Switching to: {channels[tile['channel_index']]['channel_name']}")
+        if low_memory_fetch():
+            # Only the old channels were fetched, so fetch the new ones before showing them
+            refresh_stats()
+        for tile in tiles:
+            show_tile_stats(tile)
+        fade_in(tiles)
 
     # === Periodic API Refresh ===
     if now - last_api_refresh >= interval:
-        fetch_stats_for(channel)
+        refresh_stats()
+        for tile in tiles:
+            show_tile_stats(tile)
+        # show_stats leaves the stats dark until fade_in, so collect before bringing them back
+        governor.idle("fetch")
+        fade_in(tiles)
         last_api_refresh = now
 
+    if governor.single_channel and len(tiles) > 1:
+        fall_back_to_single_channel()
+
     time.sleep(0.01)
@@ -0,0 +1,264 @@
+# network_transport.py - pluggable network layer for the YouTube stats display.
+# Copy this file to the CIRCUITPY board next to code.py.
+#
+# Every transport has the same three members the display code uses:
+#   fetch(url)      -> response with .status_code, .text and .json()
+#   is_connected    -> True/False
+#   connect()
+#
+# Pick one with NETWORK_MODE in settings.toml:
+#   "live"   - talk to the real API through matrixportal.network (default)
+#   "record" - like live, but save every response, status code and latency to RECORD_DIR
+#   "replay" - serve saved responses from RECORD_DIR, no Wi-Fi or API key needed
+#   "faults" - like live (or replay, if RECORD_DIR has recordings) with errors injected from FAULT_SEQUENCE
+#
+# Recording on the board needs a writable CIRCUITPY drive, e.g. a boot.py with storage.remount("/", readonly=False).
+# This file also runs under desktop Python, so recordings can be replayed and timed on a computer,
+# and failure_state() - the colour code.py falls back to after a failed fetch - can be checked there too.
+
+import json
+import os
+import time
+
+ETIMEDOUT = 116
+
+QUOTA_ERROR_BODY = json.dumps({
+    "error": {
+        "code": 403,
+        "message": "The request cannot be completed because you have exceeded your quota.",
+        "errors": [{"domain": "youtube.quota", "reason": "quotaExceeded"}],
+    }
+})
+MALFORMED_BODY = '{"kind": "youtube#channelListResponse", "items": [{"statistics": {"viewCo'
+FAULT_KINDS = ("ok", "timeout", "quota", "malformed", "disconnect")
+
+
+class RecordedResponse:
+    """Stands in for an adafruit_requests Response."""
+
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+    def close(self):
+        pass
+
+
+def redact_url(url):
+    """Drop the API key so recordings can be shared."""
+    start = url.find("key=")
+    if start < 0:
+        return url
+    end = url.find("&", start)
+    return url[:start] + "key=REDACTED" + (url[end:] if end >= 0 else "")
+
+
+class LiveTransport:
+    """Passes everything straight to matrixportal.network."""
+
+    def __init__(self, network):
+        self.network = network
+        self.requests = 0
+        self.total_latency = 0.0
+
+    def fetch(self, url):
+        started = time.monotonic()
+        try:
+            return self.network.fetch(url)
+        finally:
+            self.requests += 1
+            self.total_latency += time.monotonic() - started
+
+    @property
+    def is_connected(self):
+        return self.network.is_connected
+
+    def connect(self):
+        self.network.connect()
+
+
+class RecordingTransport:
+    """Fetches through another transport and saves each response to a numbered JSON file."""
+
+    def __init__(self, inner, directory):
+        self.inner = inner
+        self.directory = directory
+        self.count = len(list_recordings(directory))
+        self.requests = 0
+        self.total_latency = 0.0
+
+    def fetch(self, url):
+        started = time.monotonic()
+        response = self.inner.fetch(url)
+        status_code = getattr(response, "status_code", 200)
+        if hasattr(response, "text"):
+            text = response.text
+            response.close()
+        else:
+            # matrixportal.network.fetch can hand back an already-parsed dict
+            text = json.dumps(response)
+        latency = time.monotonic() - started
+        self.requests += 1
+        self.total_latency += latency
+        record = {"url": redact_url(url), "status_code": status_code, "latency": latency, "body": text}
+        path = f"{self.directory}/{self.count:04d}.json"
+        try:
+            with open(path, "w") as f:
+                json.dump(record, f)
+            self.count += 1
+            print(f"Recorded {path} ({status_code}, {latency:.2f}s)")
+        except OSError as e:
+            print(f"Could not record {path}: {e}")
+        return RecordedResponse(status_code, text)
+
+    @property
+    def is_connected(self):
+        return self.inner.is_connected
+
+    def connect(self):
+        self.inner.connect()
+
+
+def list_recordings(directory):
+    try:
+        return sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+    except OSError:
+        return []
+
+
+class ReplayTransport:
+    """Serves recorded responses back in order for each URL, looping when they run out.
+    A URL that was never recorded raises ValueError rather than getting another URL's stats.
+
+    time_scale=1.0 keeps the original latency, 0 answers instantly, 2.0 is twice as slow.
+    """
+
+    def __init__(self, directory, time_scale=1.0):
+        self.time_scale = time_scale
+        self.by_url = {}
+        self.positions = {}
+        self.requests = 0
+        self.total_latency = 0.0
+        for name in list_recordings(directory):
+            with open(f"{directory}/{name}") as f:
+                record = json.load(f)
+            self.by_url.setdefault(record["url"], []).append(record)
+        if not self.by_url:
+            raise ValueError(f"No recordings found in {directory}")
+
+    def fetch(self, url):
+        key = redact_url(url)
+        records = self.by_url.get(key)
+        if records is None:
+            raise ValueError(f"No recording for {key} - record again after changing channels")
+        position = self.positions.get(key, 0)
+        self.positions[key] = (position + 1) % len(records)
+        record = records[position]
+        delay = record["latency"] * self.time_scale
+        if delay > 0:
+            time.sleep(delay)
+        self.requests += 1
+        self.total_latency += delay
+        return RecordedResponse(record["status_code"], record["body"])
+
+    @property
+    def is_connected(self):
+        return True
+
+    def connect(self):
+        pass
+
+
+class FaultTransport:
+    """Wraps another transport and injects failures, cycling through a fixed sequence.
+
+    Each entry of sequence is one of FAULT_KINDS and applies to one fetch():
+    "timeout" raises OSError(ETIMEDOUT), "quota" returns YouTube's 403 quotaExceeded body,
+    "malformed" returns truncated JSON and "disconnect" drops Wi-Fi until connect() is called.
+    """
+
+    def __init__(self, inner, sequence, timeout=10):
+        for kind in sequence:
+            if kind not in FAULT_KINDS:
+                raise ValueError(f"Unknown fault {kind!r}, expected one of {FAULT_KINDS}")
+        self.inner = inner
+        self.sequence = sequence
+        self.timeout = timeout
+        self.position = 0
+        self.disconnected = False
+
+    @property
+    def requests(self):
+        return self.inner.requests
+
+    @property
+    def total_latency(self):
+        return self.inner.total_latency
+
+    def fetch(self, url):
+        kind = self.sequence[self.position]
+        self.position = (self.position + 1) % len(self.sequence)
+        if kind != "ok":
+            print(f"Injecting fault: {kind}")
+        if self.disconnected:
+            raise ConnectionError("Not connected (injected disconnect)")
+        if kind == "timeout":
+            time.sleep(self.timeout)
+            raise OSError(ETIMEDOUT, "Timed out (injected)")
+        if kind == "quota":
+            return RecordedResponse(403, QUOTA_ERROR_BODY)
+        if kind == "malformed":
+            return RecordedResponse(200, MALFORMED_BODY)
+        if kind == "disconnect":
+            self.disconnected = True
+            raise ConnectionError("Connection lost (injected)")
+        return self.inner.fetch(url)
+
+    @property
+    def is_connected(self):
+        return not self.disconnected and self.inner.is_connected
+
+    def connect(self):
+        self.disconnected = False
+        self.inner.connect()
+
+
+def failure_state(wifi_status, subs, views, default_subs, default_views,
+                  fallback_color, error_color, wifi_retry, error_retry):
+    """Stats, colour and retry interval to show after a failed fetch.
+
+    No Wi-Fi shows the defaults in fallback_color; any other failure keeps the last stats in error_color.
+    Lives here rather than in code.py so it can be imported and checked on a computer.
+    """
+    if wifi_status == "disconnected":
+        return default_subs, default_views, fallback_color, wifi_retry
+    return subs, views, error_color, error_retry
+
+
+def getenv_float(name, default):
+    """settings.toml holds only strings and ints, so fractions come quoted, e.g. "0.5"; 0 is a real value."""
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return float(value)
+
+
+def make_transport(network):
+    """Build the transport selected by NETWORK_MODE in settings.toml."""
+    mode = os.getenv("NETWORK_MODE") or "live"
+    directory = os.getenv("RECORD_DIR") or "/recordings"
+    print(f"Network mode: {mode}")
+    if mode == "live":
+        return LiveTransport(network)
+    if mode == "record":
+        return RecordingTransport(LiveTransport(network), directory)
+    if mode == "replay":
+        return ReplayTransport(directory, getenv_float("REPLAY_TIME_SCALE", 1.0))
+    if mode == "faults":
+        inner = ReplayTransport(directory, 0) if list_recordings(directory) else LiveTransport(network)
+        sequence = [kind.strip() for kind in (os.getenv("FAULT_SEQUENCE") or ",".join(FAULT_KINDS)).split(",")]
+        return FaultTransport(inner, sequence, getenv_float("FAULT_TIMEOUT", 10))
+    raise ValueError(f"Unknown NETWORK_MODE {mode!r}")
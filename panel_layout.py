@@ -0,0 +1,70 @@
+# panel_layout.py - where everything goes on the panel, shared by the boards and the computer tools.
+# Copy this file to the CIRCUITPY board next to code.py.
+#
+# code.py, multi-channel-code.py, font_eval.py and make_sprites.py all import from here,
+# so the previews and the baked sprites can't drift from what the boards draw.
+# No CircuitPython-only imports, so it also runs under desktop Python.
+
+LOGO_WIDTH = 13
+LOGO_HEIGHT = 9
+# Play glyph inside the logo, relative to PLAY_OFFSET
+PLAY_PIXELS = [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (2, 1), (2, 2), (2, 3), (3, 2)]
+PLAY_OFFSET = (4, 2)
+LOGO_RED = 1
+LOGO_WHITE = 2
+
+# Panel bit_depth is picked from the colours actually used; more bits cost refresh time on bigger panels.
+MAX_BIT_DEPTH = 6
+MIN_LIT_CHANNEL = 0x40  # A colour channel at least this bright must not quantize to off.
+
+
+def logo_pixels():
+    """(x, y, colour) for every lit pixel of the logo; colour is LOGO_RED or LOGO_WHITE."""
+    pixels = []
+    for x in range(LOGO_WIDTH):
+        for y in range(LOGO_HEIGHT):
+            if not (x in (0, LOGO_WIDTH - 1) and y in (0, LOGO_HEIGHT - 1)):
+                pixels.append((x, y, LOGO_RED))
+    for x, y in PLAY_PIXELS:
+        pixels.append((PLAY_OFFSET[0] + x, PLAY_OFFSET[1] + y, LOGO_WHITE))
+    return pixels
+
+
+def pick_bit_depth(colors):
+    """Return the lowest bit_depth that keeps every colour distinct and its bright channels lit."""
+    for depth in range(1, MAX_BIT_DEPTH + 1):
+        shift = 8 - depth
+        seen = set()
+        fits = True
+        for color in set(colors):
+            rgb = ((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)
+            quantized = tuple(c >> shift for c in rgb)
+            if quantized in seen:
+                fits = False
+                break
+            for c, q in zip(rgb, quantized):
+                if c >= MIN_LIT_CHANNEL and q == 0:
+                    fits = False
+            seen.add(quantized)
+        if fits:
+            return depth
+    return MAX_BIT_DEPTH
+
+
+def tile_layout(tile_x, tile_y, tile_width, tile_height):
+    """Positions for one channel tile. A 64x32 tile gives the original hand-placed layout."""
+    row_height = (tile_height - LOGO_HEIGHT) // 2
+    sub_y = tile_y + LOGO_HEIGHT + row_height // 2
+    views_y = sub_y + row_height
+    right = tile_x + tile_width
+    return {
+        "logo": (tile_x + 1, tile_y + 1),
+        "visible_x_start": tile_x + LOGO_WIDTH + 2,
+        "visible_x_end": right,
+        "left": tile_x,
+        "top": tile_y,
+        "sub_label": (tile_x + 2, sub_y),
+        "sub_value": (right, sub_y + 2),
+        "views_label": (tile_x + 2, views_y),
+        "views_value": (right, views_y + 2),
+    }
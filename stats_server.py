@@ -0,0 +1,194 @@
+# stats_server.py - one YouTube poller for a whole fleet of displays on your LAN.
+# Runs on any computer with Python 3 (a Raspberry Pi is plenty), no extra packages needed.
+#
+#   python stats_server.py --settings board1/settings.toml board2/settings.toml --port 8080
+#
+# It reads the same settings.toml format the boards use (single or multi-channel),
+# polls the YouTube API once per distinct channel, batching channels that share an API key
+# into one request, and serves each board a tiny CSV payload over plain HTTP:
+#
+#   GET /stats/<channel_id>   ->  "subscribers,views,age_seconds,interval_seconds\n"
+#   GET /stats                ->  one "channel_id,subscribers,views,age_seconds,interval_seconds" line per channel
+#
+# interval_seconds is this server's --interval, so boards can tell stale stats from a slow poll.
+#
+# On each board, set STATS_SERVER = "http://<this computer's IP>:8080" in settings.toml.
+# The boards then skip TLS and JSON entirely and don't need an API key,
+# and API quota depends on the number of distinct channels, not boards x channels.
+# Channels whose settings have no YOUTUBE_API_KEY are polled with --api-key, so the
+# key-less settings files of STATS_SERVER boards work as they are.
+#
+# Unknown channel ids get 404; a channel that hasn't been fetched yet gets 503.
+
+import argparse
+import json
+import re
+import threading
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+NORMAL_REFRESH_INTERVAL = 5 * 60
+ERROR_RETRY_INTERVAL = 30
+MAX_IDS_PER_REQUEST = 50  # YouTube channels.list limit
+API_URL = "https://www.googleapis.com/youtube/v3/channels?part=statistics&id={ids}&key={key}"
+
+
+def read_settings(path):
+    """KEY = "value" / KEY = 123 lines from a settings.toml, tolerant of the odd typo."""
+    settings = {}
+    with open(path) as f:
+        for line in f:
+            match = re.match(r'\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(?:"(.*)"|(-?\d+))\s*(#.*)?$', line)
+            if match:
+                key, text, number = match.group(1), match.group(2), match.group(3)
+                settings[key] = text if text is not None else int(number)
+    return settings
+
+
+def load_channels(settings):
+    """Same suffix scheme as multi-channel-code.py: CHANNEL_ID, CHANNEL_ID2, ...
+
+    api_key is None for entries without a YOUTUBE_API_KEY (boards that use STATS_SERVER).
+    """
+    channels = []
+    index = 1
+    while True:
+        suffix = f"{index}" if index > 1 else ""
+        api_key = settings.get(f"YOUTUBE_API_KEY{suffix}")
+        channel_id = settings.get(f"CHANNEL_ID{suffix}")
+        if not channel_id:
+            break
+        channels.append({"api_key": api_key, "channel_id": channel_id,
+                         "channel_name": settings.get(f"CHANNEL_NAME{suffix}", channel_id)})
+        index += 1
+    return channels
+
+
+class StatsCache:
+    def __init__(self, channels, interval):
+        self.interval = interval
+        # First API key seen for a channel is the one used to poll it
+        self.key_for = {}
+        for channel in channels:
+            self.key_for.setdefault(channel["channel_id"], channel["api_key"])
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def batches(self):
+        by_key = {}
+        for channel_id, key in self.key_for.items():
+            by_key.setdefault(key, []).append(channel_id)
+        for key, ids in by_key.items():
+            for i in range(0, len(ids), MAX_IDS_PER_REQUEST):
+                yield key, ids[i:i + MAX_IDS_PER_REQUEST]
+
+    def refresh(self):
+        """Poll every channel once. Returns True if all requests worked."""
+        ok = True
+        for key, ids in self.batches():
+            url = API_URL.format(ids=",".join(ids), key=urllib.parse.quote(key))
+            try:
+                with urllib.request.urlopen(url, timeout=15) as response:
+                    data = json.load(response)
+                self.requests += 1
+            except Exception as e:
+                print(f"API error for {len(ids)} channel(s): {e}")
+                ok = False
+                continue
+            now = time.monotonic()
+            with self.lock:
+                for item in data.get("items", []):
+                    stats = item["statistics"]
+                    self.stats[item["id"]] = (int(stats.get("subscriberCount", "0")),
+                                              int(stats.get("viewCount", "0")), now)
+            missing = set(ids) - set(item["id"] for item in data.get("items", []))
+            if missing:
+                print(f"No stats returned for: {', '.join(sorted(missing))}")
+        print(f"Refreshed {len(self.stats)} of {len(self.key_for)} channel(s), {self.requests} API requests so far")
+        return ok
+
+    def payload(self, channel_id):
+        with self.lock:
+            entry = self.stats.get(channel_id)
+        if entry is None:
+            return None
+        subs, views, fetched = entry
+        return f"{subs},{views},{int(time.monotonic() - fetched)},{self.interval}\n"
+
+    def payload_all(self):
+        with self.lock:
+            entries = list(self.stats.items())
+        now = time.monotonic()
+        return "".join(f"{channel_id},{subs},{views},{int(now - fetched)},{self.interval}\n"
+                       for channel_id, (subs, views, fetched) in entries)
+
+
+def make_handler(cache):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0].rstrip("/")
+            channel_id = urllib.parse.unquote(path[len("/stats/"):]) if path.startswith("/stats/") else None
+            status = 200
+            if path == "/stats":
+                body = cache.payload_all()
+            elif channel_id in cache.key_for:
+                body = cache.payload(channel_id)
+                if body is None:
+                    # Polled but not fetched yet: worth retrying
+                    status, body = 503, "no stats yet\n"
+            else:
+                status, body = 404, "unknown channel\n"
+            self.send_response(status)
+            data = body.encode()
+            self.send_header("Content-Type", "text/csv")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            print(f"{self.address_string()} {format % args}")
+
+    return Handler
+
+
+def poll_forever(cache, interval):
+    while True:
+        wait = interval if cache.refresh() else ERROR_RETRY_INTERVAL
+        time.sleep(wait)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll YouTube once for many displays and serve the stats on the LAN")
+    parser.add_argument("--settings", nargs="+", default=["settings.toml"],
+                        help="settings.toml files listing the channels (default: settings.toml)")
+    parser.add_argument("--host", default="0.0.0.0", help="address to listen on (default: all)")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on (default: 8080)")
+    parser.add_argument("--interval", type=int, default=NORMAL_REFRESH_INTERVAL,
+                        help=f"seconds between API polls (default: {NORMAL_REFRESH_INTERVAL})")
+    parser.add_argument("--api-key", help="API key for channels whose settings have no YOUTUBE_API_KEY")
+    args = parser.parse_args()
+
+    channels = []
+    for path in args.settings:
+        channels += load_channels(read_settings(path))
+    if not channels:
+        raise SystemExit("No YouTube channels found in the settings files")
+    for channel in channels:
+        channel["api_key"] = channel["api_key"] or args.api_key
+        if not channel["api_key"]:
+            raise SystemExit(f"No YOUTUBE_API_KEY for {channel['channel_name']}; add one or pass --api-key")
+    cache = StatsCache(channels, args.interval)
+    print(f"{len(channels)} channel entries, {len(cache.key_for)} distinct channel(s), "
+          f"{len(list(cache.batches()))} API request(s) per poll")
+
+    threading.Thread(target=poll_forever, args=(cache, args.interval), daemon=True).start()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(cache))
+    print(f"Serving stats on http://{args.host}:{args.port}/stats")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()